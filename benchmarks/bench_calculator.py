@@ -0,0 +1,90 @@
+"""Бенчмарк Calculator.calculate"""
+import time
+
+from src.pydesktop_assistant.modules.calculator.calculator import Calculator
+
+EXPRESSIONS = [
+    "2 + 3", "10 / 4", "2.5 * 4", "2 ^ 10", "-7 + 3", "100 - 0.5",
+    "(1 + 2) * 3 - 4 / 2", "sqrt(16) + 2 ^ 3 ^ 2", "-(2.5 + sin(pi / 6)) * 4",
+]
+
+
+def bench_calculator(iterations: int = 100_000) -> dict:
+    """Количество вызовов calculate в секунду на наборе типовых выражений
+
+    Выражения повторяются, поэтому после первого прохода все вызовы
+    попадают в кеш. Без кеша (разбор и компиляция на каждом вызове,
+    как до появления кеша) замер повторяется отдельно.
+    """
+    calculator = Calculator()
+    expressions = [EXPRESSIONS[i % len(EXPRESSIONS)] for i in range(iterations)]
+
+    start = time.perf_counter()
+    for expression in expressions:
+        calculator.calculate(expression)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for expression in expressions:
+        calculator.clear_cache()
+        calculator.calculate(expression)
+    uncached_elapsed = time.perf_counter() - start
+
+    return {
+        "calls": iterations,
+        "calls_per_second": iterations / elapsed,
+        "uncached_calls_per_second": iterations / uncached_elapsed,
+    }
+
+
+def bench_evaluate_many(size: int = 1_000_000, loop_sample: int = 50_000) -> dict:
+    """Элементов в секунду: векторный evaluate_many против цикла calculate
+
+    Цикл измеряется на выборке `loop_sample` элементов, чтобы бенчмарк
+    не шёл минутами на больших `size`.
+    """
+    import numpy as np
+
+    calculator = Calculator()
+    expression = "sqrt(x) * 2 + x ^ 2 / 3 - 1"
+    x = np.random.default_rng(0).uniform(1.0, 100.0, size)
+
+    start = time.perf_counter()
+    calculator.evaluate_many(expression, {"x": x})
+    vector_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for value in x[:loop_sample].tolist():
+        calculator.calculate(expression.replace("x", repr(value)))
+    loop_seconds = time.perf_counter() - start
+
+    return {
+        "elements": size,
+        "vectorized_per_second": size / vector_seconds,
+        "loop_per_second": min(size, loop_sample) / loop_seconds,
+    }
+
+
+def bench_compiled(iterations: int = 1_000_000) -> dict:
+    """Вызовов в секунду: скомпилированное выражение против обычной функции Python"""
+    calculator = Calculator()
+    expr = calculator.compile("x ^ 2 / 3 + 2 * x - 1")
+
+    def native(x):
+        return x ** 2 / 3 + 2 * x - 1
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        expr(x=i)
+    compiled_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        native(i)
+    native_seconds = time.perf_counter() - start
+
+    return {
+        "calls": iterations,
+        "compiled_per_second": iterations / compiled_seconds,
+        "native_per_second": iterations / native_seconds,
+    }
@@ -0,0 +1,95 @@
+"""Бенчмарки менеджеров заметок, задач и календаря"""
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.pydesktop_assistant.modules.calendar.calendar import CalendarManager
+from src.pydesktop_assistant.modules.notes.notes import NoteManager
+from src.pydesktop_assistant.modules.task_manager.task_manager import TaskManager
+
+
+def _measure(func, *args) -> float:
+    """Время выполнения функции в секундах"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _result(size: int, create_seconds: float, batch_seconds: float, get_all_seconds: float) -> dict:
+    """Сводка замеров для одного размера данных"""
+    return {
+        "rows": size,
+        "create_per_second": size / create_seconds,
+        "batch_create_per_second": size / batch_seconds,
+        "get_all_seconds": get_all_seconds,
+    }
+
+
+def bench_notes(size: int) -> dict:
+    """create_note, create_notes и get_all_notes на `size` строках"""
+    with tempfile.TemporaryDirectory() as tmp:
+        single = NoteManager(Path(tmp) / "single.db")
+        create_seconds = _measure(
+            lambda: [single.create_note(f"Note {i}", f"Content {i}") for i in range(size)]
+        )
+        get_all_seconds = _measure(single.get_all_notes)
+
+        batch = NoteManager(Path(tmp) / "batch.db")
+        batch_seconds = _measure(
+            batch.create_notes, ((f"Note {i}", f"Content {i}") for i in range(size))
+        )
+
+        single.db.close()
+        batch.db.close()
+    return _result(size, create_seconds, batch_seconds, get_all_seconds)
+
+
+def bench_tasks(size: int) -> dict:
+    """create_task, create_tasks и get_all_tasks на `size` строках"""
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as tmp:
+        single = TaskManager(Path(tmp) / "single.db")
+        create_seconds = _measure(
+            lambda: [
+                single.create_task(f"Task {i}", "medium", now + timedelta(minutes=i))
+                for i in range(size)
+            ]
+        )
+        get_all_seconds = _measure(single.get_all_tasks)
+
+        batch = TaskManager(Path(tmp) / "batch.db")
+        batch_seconds = _measure(
+            batch.create_tasks,
+            ((f"Task {i}", "medium", now + timedelta(minutes=i)) for i in range(size))
+        )
+
+        single.db.close()
+        batch.db.close()
+    return _result(size, create_seconds, batch_seconds, get_all_seconds)
+
+
+def bench_calendar(size: int) -> dict:
+    """add_event, add_events и get_all_events на `size` строках"""
+    # События в будущем, чтобы планировщик уведомлений не срабатывал
+    start = datetime.now() + timedelta(days=365)
+    with tempfile.TemporaryDirectory() as tmp:
+        single = CalendarManager(Path(tmp) / "single.db")
+        create_seconds = _measure(
+            lambda: [
+                single.add_event(f"Event {i}", "Description", start + timedelta(minutes=i))
+                for i in range(size)
+            ]
+        )
+        get_all_seconds = _measure(single.get_all_events)
+
+        batch = CalendarManager(Path(tmp) / "batch.db")
+        batch_seconds = _measure(
+            batch.add_events,
+            ((f"Event {i}", "Description", start + timedelta(minutes=i)) for i in range(size))
+        )
+
+        for manager in (single, batch):
+            manager.stop_notifications()
+            manager.db.close()
+    return _result(size, create_seconds, batch_seconds, get_all_seconds)
@@ -0,0 +1,25 @@
+"""Бенчмарк NotificationDispatcher: всплеск уведомлений"""
+import time
+
+from src.pydesktop_assistant.notifications import NotificationDispatcher
+
+
+def bench_notifications(count: int = 1_000, timeout: float = 30.0) -> dict:
+    """Ставит в очередь `count` уведомлений разом и измеряет показ"""
+    # Уведомления не показываем — замеряем только очередь и склейку
+    dispatcher = NotificationDispatcher(deliver=lambda title, message: None)
+
+    start = time.perf_counter()
+    for i in range(count):
+        dispatcher.notify("Таймер завершен!", str(i))
+    notify_seconds = time.perf_counter() - start
+
+    completed = dispatcher.flush(timeout)
+    dispatcher.shutdown()
+
+    return {
+        "notifications": count,
+        "completed": completed,
+        "notify_per_second": count / notify_seconds,
+        **dispatcher.stats(),
+    }
@@ -0,0 +1,84 @@
+"""Бенчмарк запуска: время импорта главного окна и время до первого кадра"""
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN_WINDOW_MODULE = "src.pydesktop_assistant.gui.main_window"
+# Пакеты, которые не должны загружаться до открытия окон модулей
+HEAVY_PACKAGES = ("plyer", "tkcalendar", "babel")
+
+FIRST_FRAME_SCRIPT = f"""
+import time
+start = time.perf_counter()
+from {MAIN_WINDOW_MODULE} import MainWindow
+app = MainWindow()
+app.update()
+print(time.perf_counter() - start)
+app.destroy()
+"""
+
+
+def import_profile(module: str = MAIN_WINDOW_MODULE) -> dict:
+    """Импортирует модуль в чистом процессе с `-X importtime`
+
+    Возвращает суммарное время импорта модуля, число загруженных
+    модулей и список загруженных «тяжёлых» пакетов.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    cumulative = {}  # модуль -> суммарное время импорта, мкс
+    for line in proc.stderr.splitlines():
+        # Формат: "import time:  self [us] | cumulative | imported package"
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1])
+
+    return {
+        "module": module,
+        "import_ms": cumulative[module] / 1000,
+        "modules_loaded": len(cumulative),
+        "heavy_loaded": sorted(name for name in cumulative if name.split(".")[0] in HEAVY_PACKAGES),
+    }
+
+
+def time_to_first_frame(repeat: int = 5) -> dict | None:
+    """Время от начала импорта до первой отрисовки главного окна
+
+    Возвращает None, если Tk не может открыть окно (нет дисплея).
+    """
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", FIRST_FRAME_SCRIPT],
+            cwd=ROOT,
+            capture_output=True,
+            text=True
+        )
+        if proc.returncode != 0:
+            return None
+        samples.append(float(proc.stdout) * 1000)
+
+    return {
+        "repeat": repeat,
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+    }
+
+
+def bench_startup(repeat: int = 5) -> dict:
+    """Профиль импорта (лучший из `repeat` прогонов) и время до первого кадра"""
+    profiles = [import_profile() for _ in range(repeat)]
+    best = min(profiles, key=lambda profile: profile["import_ms"])
+    return {
+        "import": best,
+        "first_frame": time_to_first_frame(repeat),
+    }
@@ -0,0 +1,48 @@
+"""Бенчмарк TimerManager: много одновременных таймеров"""
+import statistics
+import threading
+import time
+
+from src.pydesktop_assistant.modules.timer.timer import TimerManager
+
+
+def bench_timers(count: int = 10_000, delay: float = 1.0, timeout: float = 30.0) -> dict:
+    """Запускает `count` таймеров на `delay` секунд и измеряет опоздание срабатывания"""
+    manager = TimerManager()
+    fired = {}
+    all_fired = threading.Event()
+    lock = threading.Lock()
+
+    def record(title, message):
+        # Уведомления не показываем — замеряем только момент срабатывания
+        with lock:
+            fired[message] = time.monotonic()
+            if len(fired) == count:
+                all_fired.set()
+
+    manager._show_notification = record
+    threads_before = threading.active_count()
+
+    start = time.perf_counter()
+    deadlines = {}
+    for i in range(count):
+        timer_id = manager.start_timer(delay, str(i))
+        deadlines[str(i)] = manager.timers[timer_id]["deadline"]
+    start_seconds = time.perf_counter() - start
+    peak_threads = threading.active_count() - threads_before
+
+    completed = all_fired.wait(timeout)
+    peak_threads = max(peak_threads, threading.active_count() - threads_before)
+    manager.shutdown()
+
+    lateness = sorted(fired[key] - deadlines[key] for key in fired)
+    return {
+        "timers": count,
+        "fired": len(fired),
+        "completed": completed,
+        "start_per_second": count / start_seconds,
+        "extra_threads": peak_threads,
+        "lateness_p50_ms": statistics.median(lateness) * 1000 if lateness else None,
+        "lateness_p99_ms": lateness[min(len(lateness) - 1, int(len(lateness) * 0.99))] * 1000 if lateness else None,
+        "lateness_max_ms": lateness[-1] * 1000 if lateness else None,
+    }
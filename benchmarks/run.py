@@ -0,0 +1,75 @@
+"""Запуск всех бенчмарков с сохранением результатов в JSON
+
+Пример:
+    python -m benchmarks.run --sizes 1000 10000 --output bench.json
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+from datetime import datetime
+
+from .bench_calculator import bench_calculator, bench_compiled, bench_evaluate_many
+from .bench_managers import bench_calendar, bench_notes, bench_tasks
+from .bench_notifications import bench_notifications
+from .bench_startup import bench_startup
+from .bench_timer import bench_timers
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def run(sizes: list[int], timers: int, calc_iterations: int) -> dict:
+    """Выполняет все бенчмарки и возвращает результаты"""
+    results = {"notes": [], "tasks": [], "calendar": []}
+    for size in sizes:
+        for name, bench in (("notes", bench_notes), ("tasks", bench_tasks), ("calendar", bench_calendar)):
+            print(f"{name}: {size} строк...", file=sys.stderr)
+            results[name].append(bench(size))
+
+    print(f"timer: {timers} таймеров...", file=sys.stderr)
+    results["timer"] = bench_timers(timers)
+
+    print("notifications: всплеск уведомлений...", file=sys.stderr)
+    results["notifications"] = bench_notifications()
+
+    print(f"calculator: {calc_iterations} вызовов...", file=sys.stderr)
+    results["calculator"] = bench_calculator(calc_iterations)
+    results["calculator_compiled"] = bench_compiled(calc_iterations)
+    results["calculator_vectorized"] = bench_evaluate_many()
+
+    print("startup: импорт и первый кадр главного окна...", file=sys.stderr)
+    results["startup"] = bench_startup()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки PyDesktop Assistant")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="количество строк для бенчмарков менеджеров"
+    )
+    parser.add_argument("--timers", type=int, default=10_000, help="количество одновременных таймеров")
+    parser.add_argument("--calc-iterations", type=int, default=100_000, help="количество вызовов калькулятора")
+    parser.add_argument("--output", "-o", help="файл для JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run(args.sizes, args.timers, args.calc_iterations), indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
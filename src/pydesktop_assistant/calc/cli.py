@@ -0,0 +1,110 @@
+"""Пакетное вычисление выражений: одно выражение на строку
+
+Пример:
+    python -m src.pydesktop_assistant.calc expressions.txt -o results.txt
+    cat expressions.txt | python -m src.pydesktop_assistant.calc --workers 4
+
+Результаты выводятся в порядке входных строк; для ошибочной строки
+выводится "Ошибка: <сообщение>", пустые строки сохраняются.
+"""
+import argparse
+import itertools
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, TextIO
+
+from ..modules.calculator.calculator import Calculator
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Калькулятор процесса-исполнителя: создаётся один раз, чтобы кеш
+# выражений переживал обработку отдельных порций
+_calculator = None
+
+
+def evaluate_line(calculator: Calculator, line: str) -> str:
+    """Результат одной строки в текстовом виде"""
+    if not line.strip():
+        return ""
+    result = calculator.calculate(line)
+    if calculator.error_message:
+        return f"Ошибка: {calculator.error_message}"
+    return repr(result)
+
+
+def evaluate_chunk(lines: list[str]) -> list[str]:
+    """Вычисляет порцию строк (выполняется в процессе-исполнителе)"""
+    global _calculator
+    if _calculator is None:
+        _calculator = Calculator()
+    return [evaluate_line(_calculator, line) for line in lines]
+
+
+def chunked(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    """Разбивает поток строк на порции, не читая вход целиком"""
+    iterator = iter(lines)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def evaluate_stream(
+    lines: Iterable[str],
+    workers: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Результаты для потока строк в исходном порядке
+
+    Порции вычисляются в пуле процессов; одновременно в работе не
+    больше 2 * workers порций, поэтому память не зависит от размера
+    входа. При workers=0 всё считается в текущем процессе.
+    """
+    lines = (line.rstrip("\r\n") for line in lines)
+    if workers <= 0:
+        for chunk in chunked(lines, chunk_size):
+            yield from evaluate_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in chunked(lines, chunk_size):
+            in_flight.append(pool.submit(evaluate_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def run(source: TextIO, target: TextIO, workers: int, chunk_size: int):
+    """Читает выражения из source и пишет результаты в target"""
+    for result in evaluate_stream(source, workers, chunk_size):
+        target.write(result + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pydesktop_assistant.calc",
+        description="Пакетное вычисление выражений калькулятора"
+    )
+    parser.add_argument("input", nargs="?", help="файл с выражениями (по умолчанию stdin)")
+    parser.add_argument("--output", "-o", help="файл для результатов (по умолчанию stdout)")
+    parser.add_argument(
+        "--workers", "-j", type=int, default=os.cpu_count() or 1,
+        help="количество процессов (0 — считать в текущем процессе)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help="сколько строк отправлять процессу за раз"
+    )
+    args = parser.parse_args(argv)
+
+    source = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    target = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        run(source, target, args.workers, args.chunk_size)
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            target.close()
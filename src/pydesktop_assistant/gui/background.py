@@ -0,0 +1,85 @@
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from tkinter import messagebox
+from typing import Callable
+
+
+class BackgroundExecutor:
+    """Выполнение блокирующих вызовов (SQLite и т.п.) вне главного потока Tk
+
+    Задачи выполняются в рабочем потоке, готовые результаты складываются
+    в очередь, которую главный поток опрашивает через after(). Обработчики
+    on_success/on_error всегда вызываются в главном потоке, поэтому
+    могут свободно обращаться к виджетам. Пока задач нет, опрос не идёт.
+    Исключение из обработчика передаётся в report_error() и не мешает
+    разбирать остальные результаты.
+    """
+
+    # Период опроса очереди результатов, мс
+    POLL_MS = 20
+
+    def __init__(self, widget, executor: ThreadPoolExecutor | None = None):
+        self.widget = widget
+        # Один рабочий поток: запросы к БД выполняются в порядке отправки
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="gui-io")
+        self._results = queue.SimpleQueue()
+        self._pending = 0
+        self._poll_job = None
+        self._closed = False
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        on_success: Callable | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+        **kwargs
+    ) -> Future:
+        """Запускает func(*args, **kwargs) в рабочем потоке"""
+        future = self._executor.submit(func, *args, **kwargs)
+        self._pending += 1
+        future.add_done_callback(lambda f: self._results.put((f, on_success, on_error)))
+        self._ensure_polling()
+        return future
+
+    def shutdown(self):
+        """Прекращает опрос и отменяет ещё не начатые задачи"""
+        self._closed = True
+        if self._poll_job is not None:
+            self.widget.after_cancel(self._poll_job)
+            self._poll_job = None
+        if self._own_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_polling(self):
+        if self._poll_job is None and not self._closed:
+            self._poll_job = self.widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        """Применяет готовые результаты в главном потоке"""
+        self._poll_job = None
+        while True:
+            try:
+                future, on_success, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if future.cancelled():
+                continue
+
+            try:
+                error = future.exception()
+                if error is not None:
+                    (on_error or self.report_error)(error)
+                elif on_success is not None:
+                    on_success(future.result())
+            except Exception as callback_error:
+                self.report_error(callback_error)
+
+        if self._pending:
+            self._ensure_polling()
+
+    def report_error(self, error: BaseException):
+        """Обработчик ошибок по умолчанию"""
+        messagebox.showerror("Ошибка", f"Не удалось выполнить операцию:\n{error}", parent=self.widget)
@@ -1,14 +1,15 @@
 import tkinter as tk
 from tkinter import ttk
-from ..modules.calculator.gui import CalculatorGUI
-from ..modules.notes.gui import NotesGUI
-from ..modules.task_manager.gui import TaskManagerGUI
-from ..modules.timer.gui import TimerGUI
-from ..modules.calendar.gui import CalendarGUI
+from ..services import ServiceRegistry
+from .theme import apply_theme
 
 
 class MainWindow(tk.Tk):
-    """Главное окно приложения PyDesktop Assistant"""
+    """Главное окно приложения PyDesktop Assistant
+
+    Окна модулей (и тяжёлые зависимости вроде tkcalendar) импортируются
+    при первом открытии, чтобы главное окно появлялось быстрее.
+    """
 
     def __init__(self):
         super().__init__()
@@ -18,34 +19,16 @@ class MainWindow(tk.Tk):
         self.geometry("450x350")
         self.minsize(350, 300)
 
-        # Применяем тему и стили
-        self._setup_style()
+        # Менеджеры создаются один раз и общие для всех окон
+        self.services = ServiceRegistry()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Тема и стили применяются один раз на всё приложение
+        apply_theme(self)
 
         # Создаём и размещаем все виджеты
         self._create_widgets()
 
-    def _setup_style(self):
-        """Настройка стиля для ttk-виджетов"""
-        style = ttk.Style(self)
-        try:
-            style.theme_use('clam')
-        except tk.TclError:
-            style.theme_use(style.theme_use())
-
-        # Настраиваем стиль для кнопок: шрифт, отступы
-        style.configure(
-            "TButton",
-            font=("Segoe UI", 12),
-            padding=(10, 5)
-        )
-
-        # Стиль для заголовка
-        style.configure(
-            "Header.TLabel",
-            font=("Segoe UI", 16, "bold"),
-            foreground="#333333"
-        )
-
     def _create_widgets(self):
         """Создаём и размещаем основные виджеты"""
         # Центральный фрейм с отступами
@@ -59,7 +42,7 @@ class MainWindow(tk.Tk):
         container.columnconfigure(0, weight=1)
 
         # Заголовок вверху
-        header = ttk.Label(container, text="PyDesktop Assistant", style="Header.TLabel")
+        header = ttk.Label(container, text="PyDesktop Assistant", style="Main.Header.TLabel")
         header.grid(row=0, column=0, pady=(0, 15))
 
         # Фрейм для кнопок
@@ -82,28 +65,38 @@ class MainWindow(tk.Tk):
 
         # Создаём кнопки по порядку
         for idx, (text, cmd) in enumerate(buttons):
-            btn = ttk.Button(buttons_frame, text=text, command=cmd)
+            btn = ttk.Button(buttons_frame, text=text, command=cmd, style="Main.TButton")
             btn.grid(row=idx, column=0, sticky="ew", pady=5)
 
     def open_calculator(self):
         """Открыть окно калькулятора"""
+        from ..modules.calculator.gui import CalculatorGUI
         CalculatorGUI(self)
 
     def open_notes(self):
         """Открыть окно заметок"""
-        NotesGUI(self)
+        from ..modules.notes.gui import NotesGUI
+        NotesGUI(self, services=self.services)
 
     def open_task_manager(self):
         """Открыть окно менеджера задач"""
-        TaskManagerGUI(self)
+        from ..modules.task_manager.gui import TaskManagerGUI
+        TaskManagerGUI(self, services=self.services)
 
     def open_timer(self):
         """Открыть окно таймера"""
-        TimerGUI(self)
+        from ..modules.timer.gui import TimerGUI
+        TimerGUI(self, services=self.services)
 
     def open_calendar(self):
         """Открыть окно календаря"""
-        CalendarGUI(self)
+        from ..modules.calendar.gui import CalendarGUI
+        CalendarGUI(self, services=self.services)
+
+    def _on_close(self):
+        """Закрытие приложения: останавливаем фоновые потоки и закрываем БД"""
+        self.destroy()
+        self.services.shutdown()
 
 
 if __name__ == "__main__":
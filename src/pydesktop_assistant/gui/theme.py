@@ -0,0 +1,45 @@
+from tkinter import ttk
+
+FONT = "Segoe UI"
+
+# Все стили приложения: имя стиля ttk -> параметры.
+# Базовые стили (TLabel, TButton, ...) общие для окон модулей,
+# у главного окна и калькулятора свои именованные варианты.
+STYLES = {
+    # Окна модулей
+    "TLabelframe.Label": {"font": (FONT, 12, "bold"), "foreground": "#444444"},
+    "TLabel": {"font": (FONT, 10), "foreground": "#333333"},
+    "TButton": {"font": (FONT, 11), "padding": (8, 4)},
+    "Treeview.Heading": {"font": (FONT, 10, "bold"), "foreground": "#222222"},
+    "Treeview": {"font": (FONT, 10), "rowheight": 24},
+    "Header.TLabel": {"font": (FONT, 16, "bold"), "foreground": "#2E4053"},
+    # Главное окно
+    "Main.TButton": {"font": (FONT, 12), "padding": (10, 5)},
+    "Main.Header.TLabel": {"font": (FONT, 16, "bold"), "foreground": "#333333"},
+    # Калькулятор
+    "Calculator.TEntry": {"font": (FONT, 20), "padding": 15},
+    "Calculator.TButton": {"font": (FONT, 14), "padding": (10, 10)},
+    "Calculator.Preview.TLabel": {"font": (FONT, 12), "foreground": "#777777"},
+}
+
+# Переменная Tcl, отмечающая, что тема уже применена в этом интерпретаторе
+_APPLIED_FLAG = "::pydesktop_theme_applied"
+
+
+def apply_theme(widget) -> ttk.Style:
+    """Применяет тему и стили приложения один раз на интерпретатор Tk
+
+    Повторные вызовы (при открытии следующих окон) ничего не меняют
+    и не заставляют Tk пересчитывать уже открытые окна.
+    """
+    style = ttk.Style(widget)
+    if widget.tk.call("info", "exists", _APPLIED_FLAG):
+        return style
+
+    if "clam" in style.theme_names():
+        style.theme_use("clam")
+    for name, options in STYLES.items():
+        style.configure(name, **options)
+
+    widget.tk.setvar(_APPLIED_FLAG, 1)
+    return style
@@ -0,0 +1,67 @@
+from typing import Hashable, Iterable
+
+
+class TreeviewSync:
+    """Инкрементальное обновление ttk.Treeview
+
+    Хранит соответствие ключ строки -> элемент таблицы и при каждом
+    обновлении трогает только вставленные, удалённые и изменённые
+    строки, а не пересоздаёт всю таблицу.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._items = {}  # ключ -> id элемента Treeview
+        self._keys = {}  # id элемента Treeview -> ключ
+        self._rows = {}  # ключ -> (values, tags), как они сейчас показаны
+        self._order = []  # ключи в порядке отображения
+
+    def sync(self, rows: Iterable[tuple[Hashable, tuple, tuple]]):
+        """Приводит таблицу к списку строк (ключ, values, tags)"""
+        rows = [(key, tuple(values), tuple(tags)) for key, values, tags in rows]
+        new_keys = {key for key, _, _ in rows}
+
+        # Удаляем исчезнувшие строки одним вызовом
+        removed = [key for key in self._order if key not in new_keys]
+        if removed:
+            items = [self._items.pop(key) for key in removed]
+            self.tree.delete(*items)
+            for key, item in zip(removed, items):
+                del self._rows[key]
+                del self._keys[item]
+
+        # Если порядок оставшихся строк изменился (например, другая сортировка),
+        # их придётся переставить
+        kept_order = [key for key in self._order if key in new_keys]
+        reordered = kept_order != [key for key, _, _ in rows if key in self._items]
+
+        for index, (key, values, tags) in enumerate(rows):
+            item = self._items.get(key)
+            if item is None:
+                item = self.tree.insert("", index, values=values, tags=tags)
+                self._items[key] = item
+                self._keys[item] = key
+            else:
+                if self._rows[key] != (values, tags):
+                    self.tree.item(item, values=values, tags=tags)
+                if reordered:
+                    self.tree.move(item, "", index)
+            self._rows[key] = (values, tags)
+
+        self._order = [key for key, _, _ in rows]
+
+    def keys(self) -> list[Hashable]:
+        """Ключи строк в порядке отображения"""
+        return list(self._order)
+
+    def item_for(self, key: Hashable) -> str | None:
+        """Элемент Treeview для ключа (None, если строки нет)"""
+        return self._items.get(key)
+
+    def key_for(self, item: str) -> Hashable | None:
+        """Ключ строки для элемента Treeview"""
+        return self._keys.get(item)
+
+    def clear(self):
+        """Удаляет все строки"""
+        self.sync([])
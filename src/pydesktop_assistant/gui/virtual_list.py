@@ -0,0 +1,317 @@
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Callable, Hashable
+
+from .tree_sync import TreeviewSync
+
+# Строка виртуального списка: (ключ, values, tags)
+Row = tuple[Hashable, tuple, tuple]
+
+
+class PagedRowSource:
+    """Постраничный источник строк с LRU-кешем страниц
+
+    `count()` возвращает общее число строк, `fetch(offset, limit)` —
+    строки одной страницы. Запрашиваются только страницы, попавшие
+    в видимое окно.
+    """
+
+    def __init__(
+        self,
+        count: Callable[[], int],
+        fetch: Callable[[int, int], list[Row]],
+        page_size: int = 100,
+        max_pages: int = 20
+    ):
+        self.count = count
+        self.fetch = fetch
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.total = 0
+        self._pages = OrderedDict()  # номер страницы -> строки
+
+    def reload(self):
+        """Сбрасывает кеш и заново получает количество строк"""
+        self._pages.clear()
+        self.total = self.count()
+
+    def reset(self, total: int):
+        """Сбрасывает кеш при уже известном количестве строк"""
+        self._pages.clear()
+        self.total = total
+
+    def page_numbers(self, start: int, end: int) -> range:
+        """Номера страниц, покрывающих строки start <= i < end"""
+        end = min(end, self.total)
+        return range(start // self.page_size, (end - 1) // self.page_size + 1)
+
+    def missing_pages(self, start: int, end: int) -> list[int]:
+        """Страницы окна, которых ещё нет в кеше"""
+        return [page for page in self.page_numbers(start, end) if page not in self._pages]
+
+    def store_page(self, page: int, rows: list[Row]):
+        """Кладёт в кеш страницу, полученную извне (например, в фоне)"""
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def rows(self, start: int, end: int) -> list[Row]:
+        """Строки с индексами start <= i < end"""
+        end = min(end, self.total)
+        rows = []
+        for page in self.page_numbers(start, end):
+            page_start = page * self.page_size
+            page_rows = self._page(page)
+            rows.extend(page_rows[max(start, page_start) - page_start:end - page_start])
+        return rows
+
+    def _page(self, page: int) -> list[Row]:
+        """Страница из кеша или из источника"""
+        rows = self._pages.get(page)
+        if rows is None:
+            rows = self.fetch(page * self.page_size, self.page_size)
+            self.store_page(page, rows)
+        else:
+            self._pages.move_to_end(page)
+        return rows
+
+
+class VirtualList(ttk.Frame):
+    """Таблица для очень больших наборов строк
+
+    Создаёт элементы Treeview только для видимых строк и небольшого
+    запаса под ними, а данные запрашивает страницами по мере
+    прокрутки.
+
+    Если передан executor (BackgroundExecutor), количество строк
+    и страницы запрашиваются в фоновом потоке; ответы, пришедшие
+    после очередного refresh(), отбрасываются по номеру поколения.
+    """
+
+    # Сколько строк сверх видимых держать отрисованными
+    OVERSCAN = 5
+
+    def __init__(
+        self,
+        master,
+        columns: tuple[str, ...],
+        count: Callable[[], int],
+        fetch: Callable[[int, int], list[Row]],
+        height: int = 12,
+        page_size: int = 100,
+        executor=None
+    ):
+        super().__init__(master)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.source = PagedRowSource(count, fetch, page_size=page_size)
+        self.executor = executor
+        self._generation = 0  # растёт при каждом refresh()
+        self._requested = set()  # (поколение, страница), уже запрошенные в фоне
+        self._first = 0  # индекс первой видимой строки
+        self._shown_first = 0  # индекс первой строки, которая сейчас на экране
+        self._stale = False  # на экране прежние строки, окно ждёт загрузки страниц
+        self._pending_index = None  # строка, которую выделить после отрисовки окна
+        self._visible = height  # сколько строк помещается в таблицу
+        self._selected_key = None
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=columns,
+            show="headings",
+            selectmode="browse",
+            height=height
+        )
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self._sync = TreeviewSync(self.tree)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible))
+
+    def heading(self, column: str, **kwargs):
+        """Настройка заголовка колонки"""
+        self.tree.heading(column, **kwargs)
+
+    def column(self, column: str, **kwargs):
+        """Настройка колонки"""
+        self.tree.column(column, **kwargs)
+
+    def tag_configure(self, tag: str, **kwargs):
+        """Настройка тега строк"""
+        self.tree.tag_configure(tag, **kwargs)
+
+    def refresh(self):
+        """Перечитывает данные и перерисовывает видимое окно"""
+        if self.executor is None:
+            self.source.reload()
+            self._render()
+            return
+
+        self._generation += 1
+        self._requested.clear()
+        generation = self._generation
+        self.executor.submit(
+            self.source.count,
+            on_success=lambda total: self._on_count_loaded(generation, total)
+        )
+
+    def selected_key(self) -> Hashable | None:
+        """Ключ выбранной строки (даже если она прокручена за пределы окна)"""
+        return self._selected_key
+
+    def clear_selection(self):
+        """Снимает выделение"""
+        self._selected_key = None
+        self._pending_index = None
+        self.tree.selection_remove(*self.tree.selection())
+
+    def _render(self):
+        """Отрисовывает строки видимого окна"""
+        max_first = max(0, self.source.total - self._visible)
+        self._first = max(0, min(self._first, max_first))
+
+        start, end = self._first, self._first + self._visible + self.OVERSCAN
+        if self.executor is not None:
+            missing = self.source.missing_pages(start, end)
+            if missing:
+                # Пока страницы грузятся, показываем прежние строки
+                self._stale = True
+                self._request_pages(missing)
+                return
+
+        rows = self.source.rows(start, end)
+        self._sync.sync(rows)
+        self.tree.yview_moveto(0)
+        self._shown_first = self._first
+        self._stale = False
+        self._select_pending()
+
+        # Восстанавливаем выделение, если выбранная строка снова видна
+        item = self._sync.item_for(self._selected_key)
+        if item is not None and self.tree.selection() != (item,):
+            self.tree.selection_set(item)
+
+        if self.source.total:
+            self.scrollbar.set(
+                self._first / self.source.total,
+                min(1.0, (self._first + self._visible) / self.source.total)
+            )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_count_loaded(self, generation: int, total: int):
+        if generation == self._generation:
+            self.source.reset(total)
+            self._render()
+
+    def _request_pages(self, pages: list[int]):
+        """Запрашивает недостающие страницы в фоновом потоке"""
+        generation = self._generation
+        page_size = self.source.page_size
+        for page in pages:
+            if (generation, page) in self._requested:
+                continue
+            self._requested.add((generation, page))
+            self.executor.submit(
+                self.source.fetch,
+                page * page_size,
+                page_size,
+                on_success=lambda rows, page=page: self._on_page_loaded(generation, page, rows),
+                on_error=lambda error, page=page: self._on_page_failed(generation, page, error)
+            )
+
+    def _on_page_loaded(self, generation: int, page: int, rows: list[Row]):
+        self._requested.discard((generation, page))
+        if generation == self._generation:
+            self.source.store_page(page, rows)
+            self._render()
+
+    def _on_page_failed(self, generation: int, page: int, error: BaseException):
+        # Страницу можно будет запросить снова при следующей отрисовке
+        self._requested.discard((generation, page))
+        self.executor.report_error(error)
+
+    def _scroll_to(self, first: int):
+        """Прокручивает окно к строке с индексом first"""
+        max_first = max(0, self.source.total - self._visible)
+        first = max(0, min(first, max_first))
+        if first != self._first:
+            self._first = first
+            self._render()
+
+    def _scroll_by(self, rows: int):
+        self._scroll_to(self._first + rows)
+        return "break"
+
+    def _on_scrollbar(self, action: str, *args):
+        """Обработка команд полосы прокрутки"""
+        if action == "moveto":
+            self._scroll_to(int(float(args[0]) * self.source.total))
+        elif action == "scroll":
+            step = self._visible if args[1] == "pages" else 1
+            self._scroll_by(int(args[0]) * step)
+
+    def _on_mousewheel(self, event):
+        # На Windows delta кратна 120, на macOS — единицы
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-delta * 3)
+
+    def _on_resize(self, event):
+        """Пересчёт количества видимых строк при изменении размера"""
+        rowheight = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        # Одна строка уходит на заголовки колонок
+        visible = max(1, event.height // rowheight - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self._selected_key = self._sync.key_for(selection[0])
+
+    def _move_selection(self, delta: int):
+        """Перемещение выделения клавишами с прокруткой окна"""
+        if not self.source.total:
+            return "break"
+
+        keys = self._sync.keys()
+        if self._pending_index is not None:
+            # Предыдущее нажатие ещё ждёт загрузки страницы
+            index = self._pending_index + delta
+        elif self._selected_key in keys:
+            index = self._shown_first + keys.index(self._selected_key) + delta
+        else:
+            index = self._first
+        index = max(0, min(index, self.source.total - 1))
+
+        if index < self._first:
+            self._scroll_to(index)
+        elif index >= self._first + self._visible:
+            self._scroll_to(index - self._visible + 1)
+
+        self._pending_index = index
+        self._select_pending()
+        return "break"
+
+    def _select_pending(self):
+        """Выделяет строку, выбранную клавишами, если её окно уже отрисовано"""
+        if self._pending_index is None or self._stale:
+            return
+        keys = self._sync.keys()
+        position = self._pending_index - self._shown_first
+        self._pending_index = None
+        if 0 <= position < len(keys):
+            self._selected_key = keys[position]
+            self.tree.selection_set(self._sync.item_for(self._selected_key))
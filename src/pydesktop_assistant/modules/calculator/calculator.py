@@ -1,47 +1,312 @@
+import math
+import time
+from collections import OrderedDict
+from .compiler import CompiledExpr, compile_tree
+from .limits import CostLimitError, CostLimits
+from .parser import BinOp, Call, Name, Node, Number, Token, UnaryOp, parse, parse_tokens
+
+
 class Calculator:
-    """Класс калькулятора"""
+    """Класс калькулятора
+
+    Выражение разбирается в синтаксическое дерево (см. parser.py)
+    и компилируется в цепочку замыканий (см. compiler.py).
+    Скомпилированные выражения хранятся в LRU-кеше, повторное
+    вычисление не разбирает строку заново.
+    """
+
+    # Сколько скомпилированных выражений держать в кеше
+    EXPRESSION_CACHE_SIZE = 256
+
+    # Встроенные функции одного аргумента
+    FUNCTIONS = {
+        'sqrt': math.sqrt,
+        'sin': math.sin,
+        'cos': math.cos,
+        'tan': math.tan,
+        'log': math.log10,
+        'ln': math.log,
+        'exp': math.exp,
+        'abs': abs
+    }
+    # Встроенные константы
+    CONSTANTS = {
+        'pi': math.pi,
+        'e': math.e
+    }
+    # Векторные аналоги встроенных функций (имена функций numpy)
+    ARRAY_FUNCTIONS = {
+        'sqrt': 'sqrt',
+        'sin': 'sin',
+        'cos': 'cos',
+        'tan': 'tan',
+        'log': 'log10',
+        'ln': 'log',
+        'exp': 'exp',
+        'abs': 'abs'
+    }
 
-    def __init__(self):
+    def __init__(self, limits: CostLimits | None = None):
         self.error_message = None
+        self.limits = limits or CostLimits()
         self.operations = {
             '+': lambda a, b: a + b,
             '-': lambda a, b: a - b,
             '*': lambda a, b: a * b,
-            '/': lambda a, b: a / b if b != 0 else self._handle_error("Деление на ноль"),
-            '^': lambda a, b: a ** b,
-            '**': lambda a, b: a ** b
+            '/': self._divide,
+            '^': self._power,
+            '**': self._power
         }
+        # Встроенные функции вместе с теми, которым нужны ограничения экземпляра
+        self.functions = {**self.FUNCTIONS, 'fact': self._factorial}
+        # LRU-кеш: нормализованное выражение -> CompiledExpr
+        self._expression_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def calculate(self, expression: str) -> float:
         """Вычисляет математическое выражение"""
         self.error_message = None
         try:
-            a, op, b = self._parse_expression(expression)
-            operation = self.operations.get(op)
+            return float(self.compile(expression)())
+        except ValueError as e:
+            return self._handle_error(str(e))
+        except Exception as e:
+            return self._handle_error(f"Ошибка вычисления: {str(e)}")
 
-            if not operation:
-                return self._handle_error(f"Неподдерживаемый оператор: {op}")
+    def calculate_tokens(self, tokens: list[Token]) -> float:
+        """Вычисляет выражение по готовым лексемам (см. IncrementalTokenizer)
 
-            return operation(a, b)
+        Ошибки обрабатываются так же, как в calculate(). Кеш выражений
+        не используется: лексемы приходят от постоянно меняющегося текста.
+        """
+        self.error_message = None
+        try:
+            compiled = compile_tree(
+                "",
+                parse_tokens(tokens),
+                self.operations,
+                self.functions,
+                self.CONSTANTS
+            )
+            return float(compiled())
         except ValueError as e:
             return self._handle_error(str(e))
         except Exception as e:
             return self._handle_error(f"Ошибка вычисления: {str(e)}")
 
-    def _parse_expression(self, expr: str) -> tuple[float, str, float]:
-        """Парсит выражение на операнды и оператор"""
-        expr = expr.strip().replace(' ', '')
+    def compile(self, expression: str) -> CompiledExpr:
+        """Компилирует выражение для многократного вычисления
+
+        Возвращает вызываемый объект: `calc.compile("x ^ 2 + 1")(x=3)`.
+        Ошибки разбора и ошибки, найденные при свёртке констант,
+        выбрасываются как ValueError (error_message не заполняется).
+        """
+        # Пробелы между лексемами на разбор не влияют, поэтому серии
+        # пробелов сводим к одному (убирать их совсем нельзя: "2 3" != "23")
+        key = " ".join(expression.split())
+        compiled = self._expression_cache.get(key)
+        if compiled is not None:
+            self.cache_hits += 1
+            self._expression_cache.move_to_end(key)
+            return compiled
+
+        self.cache_misses += 1
+        compiled = compile_tree(
+            expression,
+            parse(expression),
+            self.operations,
+            self.functions,
+            self.CONSTANTS
+        )
+        self._expression_cache[key] = compiled
+        while len(self._expression_cache) > self.EXPRESSION_CACHE_SIZE:
+            self._expression_cache.popitem(last=False)
+        return compiled
+
+    def clear_cache(self):
+        """Очищает кеш выражений и счётчики попаданий"""
+        self._expression_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def evaluate_many(self, expression: str, variables: dict):
+        """Вычисляет выражение сразу для массивов значений переменных
+
+        Выражение разбирается один раз и вычисляется векторно средствами
+        NumPy. Ошибки обрабатываются так же, как в calculate(), но
+        поэлементно: где делитель равен нулю, аргумент функции
+        недопустим или результат слишком велик, в результате стоит NaN,
+        остальные элементы вычисляются как обычно. error_message — первая
+        такая ошибка. Массив целиком из NaN возвращается только при
+        ошибках всего выражения (синтаксис, неизвестное имя, несовпадение
+        размеров массивов, превышение limits.max_seconds).
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("Для evaluate_many нужен пакет numpy") from e
+
+        self.error_message = None
+        shape = ()  # форма результата, пока входные массивы не проверены
+        try:
+            arrays = {}
+            for name, values in variables.items():
+                try:
+                    arrays[name] = np.asarray(values, dtype=float)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Недопустимые значения переменной {name}") from None
+            try:
+                shape = np.broadcast_shapes(*(array.shape for array in arrays.values()))
+            except ValueError:
+                raise ValueError("Размеры массивов переменных не совпадают") from None
+
+            errors = []  # сообщения об ошибках отдельных элементов
+            # Ошибки элементов отмечаются явно, предупреждения NumPy не нужны
+            with np.errstate(all='ignore'):
+                deadline = time.monotonic() + self.limits.max_seconds
+                tree = self.compile(expression).tree
+                result = self._evaluate_array(tree, arrays, np, deadline, errors)
+            if errors:
+                self._handle_error(errors[0])
+            return np.array(np.broadcast_to(result, shape), dtype=float)
+        except ValueError as e:
+            self._handle_error(str(e))
+        except Exception as e:
+            self._handle_error(f"Ошибка вычисления: {str(e)}")
+        return np.full(shape, np.nan)
+
+    def _evaluate_array(self, node: Node, arrays: dict, np, deadline: float, errors: list[str]):
+        """Векторное вычисление узла синтаксического дерева
+
+        Элементы с ошибкой заменяются на NaN, сообщение добавляется в errors.
+        """
+        if time.monotonic() >= deadline:
+            raise CostLimitError(f"Превышено время вычисления ({self.limits.max_seconds} с)")
+        if isinstance(node, Number):
+            return node.value
+        if isinstance(node, BinOp):
+            left = self._evaluate_array(node.left, arrays, np, deadline, errors)
+            right = self._evaluate_array(node.right, arrays, np, deadline, errors)
+            if node.op == '/':
+                result = np.divide(left, right)
+                return self._mask_errors(result, np.asarray(right) == 0, "Деление на ноль", np, errors)
+            if node.op in ('^', '**'):
+                return self._power_array(left, right, np, errors)
+            return self.operations[node.op](left, right)
+        if isinstance(node, UnaryOp):
+            value = self._evaluate_array(node.operand, arrays, np, deadline, errors)
+            return -value if node.op == '-' else value
+        if isinstance(node, Name):
+            if node.name in arrays:
+                return arrays[node.name]
+            if node.name not in self.CONSTANTS:
+                raise ValueError(f"Неизвестная переменная: {node.name}")
+            return self.CONSTANTS[node.name]
+        if isinstance(node, Call):
+            if node.name not in self.functions:
+                raise ValueError(f"Неизвестная функция: {node.name}")
+            if len(node.args) != 1:
+                raise ValueError(f"Функция {node.name} принимает один аргумент")
+            value = self._evaluate_array(node.args[0], arrays, np, deadline, errors)
+            return self._call_array(node.name, value, np, errors)
+        raise TypeError(f"Неизвестный узел выражения: {node!r}")
+
+    def _power_array(self, left, right, np, errors: list[str]):
+        """Векторное возведение в степень с теми же проверками, что в _power"""
+        left = np.asarray(left, dtype=float)
+        right = np.asarray(right, dtype=float)
+        # Оценка числа цифр результата: b * log10|a|
+        base = np.abs(left)
+        log_base = np.log10(base, out=np.zeros_like(base), where=base != 0)
+
+        result = np.power(left, right)
+        result = self._mask_errors(
+            result, (left < 0) & (right != np.floor(right)),
+            "Дробная степень отрицательного числа", np, errors
+        )
+        result = self._mask_errors(
+            result, right * log_base > self.limits.max_digits,
+            str(self._too_large()), np, errors
+        )
+        return self._mask_errors(result, (left == 0) & (right < 0), "Деление на ноль", np, errors)
+
+    def _call_array(self, name: str, value, np, errors: list[str]):
+        """Векторный вызов встроенной функции
+
+        Элементы, на которых функция даёт не конечный результат при
+        конечном аргументе, проверяются скалярной функцией: так
+        сообщение об ошибке совпадает с calculate().
+        """
+        function = self.functions[name]
+        value = np.asarray(value, dtype=float)
+        if name in self.ARRAY_FUNCTIONS:
+            result = getattr(np, self.ARRAY_FUNCTIONS[name])(value)
+            suspect = ~np.isfinite(result) & np.isfinite(value)
+        else:
+            # У функции нет аналога в NumPy — применяем её поэлементно
+            result = np.full(value.shape, np.nan)
+            suspect = np.zeros(value.shape, dtype=bool)
+            for index, element in np.ndenumerate(value):
+                try:
+                    result[index] = function(element)
+                except Exception:
+                    suspect[index] = True
+
+        messages = [self._scalar_call_error(name, function, float(element)) for element in value[suspect]]
+        failed = np.zeros(value.shape, dtype=bool)
+        failed[suspect] = [message is not None for message in messages]
+        message = next((message for message in messages if message is not None), None)
+        return self._mask_errors(result, failed, message, np, errors)
+
+    @staticmethod
+    def _scalar_call_error(name: str, function, value: float) -> str | None:
+        """Сообщение calculate() об ошибке вызова функции или None"""
+        try:
+            function(value)
+        except CostLimitError as e:
+            return str(e)
+        except ValueError:
+            return f"Недопустимый аргумент функции {name}"
+        except Exception as e:
+            return f"Ошибка вычисления: {str(e)}"
+        return None
+
+    @staticmethod
+    def _mask_errors(result, failed, message: str, np, errors: list[str]):
+        """Заменяет на NaN элементы с ошибкой и запоминает сообщение"""
+        if not np.any(failed):
+            return result
+        errors.append(message)
+        return np.where(failed, np.nan, result)
+
+    @staticmethod
+    def _divide(a: float, b: float) -> float:
+        if b == 0:
+            raise ValueError("Деление на ноль")
+        return a / b
 
-        # Список поддерживаемых операторов в порядке приоритета распознавания
-        operators = ['**', '^', '*', '/', '+', '-']
+    def _power(self, a: float, b: float) -> float:
+        """Возведение в степень с оценкой размера результата"""
+        if a < 0 and b != int(b):
+            raise ValueError("Дробная степень отрицательного числа")
+        if a == 0 and b < 0:
+            raise ValueError("Деление на ноль")
+        if a != 0 and b * math.log10(abs(a)) > self.limits.max_digits:
+            raise self._too_large()
+        return a ** b
 
-        for op in operators:
-            if op in expr:
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
-                    return float(parts[0]), op, float(parts[1])
+    def _factorial(self, n: float) -> float:
+        """Факториал с оценкой размера результата"""
+        if n < 0 or n != int(n):
+            raise ValueError("Недопустимый аргумент функции fact")
+        # lgamma(n + 1) = ln(n!), число цифр оцениваем без вычисления факториала
+        if math.lgamma(n + 1) / math.log(10) > self.limits.max_digits:
+            raise self._too_large()
+        return float(math.factorial(int(n)))
 
-        raise ValueError("Не удалось распознать выражение")
+    def _too_large(self) -> CostLimitError:
+        return CostLimitError(f"Слишком большой результат (больше {self.limits.max_digits} цифр)")
 
     def _handle_error(self, message: str) -> float:
         """Обработка ошибок с сохранением сообщения"""
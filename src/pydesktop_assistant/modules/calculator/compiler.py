@@ -0,0 +1,153 @@
+from typing import Callable
+
+from .limits import CostLimitError
+from .parser import BinOp, Call, Name, Node, Number, UnaryOp
+
+# Скомпилированный узел: функция от словаря переменных
+Closure = Callable[[dict], float]
+
+
+class CompiledExpr:
+    """Выражение, скомпилированное в цепочку замыканий
+
+    Вызов `expr(x=1.5)` вычисляет выражение без разбора строки
+    и без обхода дерева. Подвыражения без переменных вычислены
+    заранее (свёртка констант).
+    """
+
+    __slots__ = ("expression", "tree", "variables", "_closure")
+
+    def __init__(self, expression: str, tree: Node, variables: frozenset[str], closure: Closure):
+        self.expression = expression
+        self.tree = tree  # исходное дерево (нужно для векторного вычисления)
+        self.variables = variables  # имена переменных, от которых зависит выражение
+        self._closure = closure
+
+    def __call__(self, **variables) -> float:
+        try:
+            return self._closure(variables)
+        except KeyError as e:
+            raise ValueError(f"Неизвестная переменная: {e.args[0]}") from None
+
+    def __repr__(self) -> str:
+        return f"CompiledExpr({self.expression!r})"
+
+
+def compile_tree(
+    expression: str,
+    tree: Node,
+    operations: dict[str, Callable],
+    functions: dict[str, Callable],
+    constants: dict[str, float]
+) -> CompiledExpr:
+    """Компилирует синтаксическое дерево в CompiledExpr
+
+    Ошибки, обнаруживаемые при компиляции (неизвестная функция,
+    деление на константный ноль и т.п.), выбрасываются как ValueError.
+    """
+    compiler = _Compiler(operations, functions, constants)
+    value = compiler.lower(tree)
+    if not callable(value):
+        closure = lambda env, value=value: value
+    else:
+        closure = value
+    return CompiledExpr(expression, tree, frozenset(compiler.variables), closure)
+
+
+class _Compiler:
+    """Перевод узлов дерева в замыкания
+
+    lower() возвращает число, если значение узла известно при
+    компиляции, иначе замыкание от словаря переменных.
+    """
+
+    def __init__(self, operations, functions, constants):
+        self.operations = operations
+        self.functions = functions
+        self.constants = constants
+        self.variables = set()
+
+    def lower(self, node: Node):
+        if isinstance(node, Number):
+            return node.value
+        if isinstance(node, Name):
+            return self._name(node)
+        if isinstance(node, UnaryOp):
+            return self._unary(node)
+        if isinstance(node, BinOp):
+            return self._binop(node)
+        if isinstance(node, Call):
+            return self._call(node)
+        raise TypeError(f"Неизвестный узел выражения: {node!r}")
+
+    def _name(self, node: Name):
+        if node.name in self.constants:
+            return self.constants[node.name]
+        self.variables.add(node.name)
+        name = node.name
+        return lambda env: env[name]
+
+    def _unary(self, node: UnaryOp):
+        operand = self.lower(node.operand)
+        if node.op == '+':
+            return operand
+        if not callable(operand):
+            return -operand
+        return lambda env: -operand(env)
+
+    def _binop(self, node: BinOp):
+        left = self.lower(node.left)
+        right = self.lower(node.right)
+        op = node.op
+        function = self.operations[op]
+
+        # Свёртка констант: обе части известны заранее
+        if not callable(left) and not callable(right):
+            return function(left, right)
+
+        # Сложение, вычитание и умножение встраиваются в замыкание
+        # напрямую, без вызова функции из таблицы операций
+        if not callable(left):
+            if op == '+':
+                return lambda env: left + right(env)
+            if op == '-':
+                return lambda env: left - right(env)
+            if op == '*':
+                return lambda env: left * right(env)
+            return lambda env: function(left, right(env))
+        if not callable(right):
+            if op == '+':
+                return lambda env: left(env) + right
+            if op == '-':
+                return lambda env: left(env) - right
+            if op == '*':
+                return lambda env: left(env) * right
+            return lambda env: function(left(env), right)
+        if op == '+':
+            return lambda env: left(env) + right(env)
+        if op == '-':
+            return lambda env: left(env) - right(env)
+        if op == '*':
+            return lambda env: left(env) * right(env)
+        return lambda env: function(left(env), right(env))
+
+    def _call(self, node: Call):
+        name = node.name
+        function = self.functions.get(name)
+        if function is None:
+            raise ValueError(f"Неизвестная функция: {name}")
+        if len(node.args) != 1:
+            raise ValueError(f"Функция {name} принимает один аргумент")
+
+        def apply(value):
+            try:
+                return function(value)
+            except CostLimitError:
+                raise
+            except ValueError:
+                raise ValueError(f"Недопустимый аргумент функции {name}") from None
+
+        argument = self.lower(node.args[0])
+        if not callable(argument):
+            return apply(argument)
+        return lambda env: apply(argument(env))
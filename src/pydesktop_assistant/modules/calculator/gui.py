@@ -1,46 +1,46 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from .calculator import Calculator
+from .parser import IncrementalTokenizer, ParseError
+from ...gui.theme import apply_theme
 
 
 class CalculatorGUI(tk.Toplevel):
     """Класс графического интерфейса калькулятора"""
 
+    # Задержка пересчёта предпросмотра после последнего ввода, мс
+    PREVIEW_DELAY_MS = 150
+
+    # Клавиши, которые вводят символ в выражение как есть
+    INPUT_CHARS = set("0123456789.+-*/^()")
+    # Остальные клавиши: keysym -> кнопка калькулятора
+    KEY_ACTIONS = {
+        "Return": "=",
+        "KP_Enter": "=",
+        "equal": "=",
+        "BackSpace": "⌫",
+        "Escape": "C",
+        "Delete": "C",
+    }
+
     def __init__(self, master=None):
         super().__init__(master)
         self.calculator = Calculator()
         self.title("Калькулятор")
-        self.geometry("320x450")
-        self.minsize(300, 420)
+        self.geometry("320x500")
+        self.minsize(300, 470)
         self.current_expression = ""
+        self._tokenizer = IncrementalTokenizer()
+        self._preview_job = None
 
-        # Настраиваем стили
-        self._setup_style()
+        # Тема и стили применяются один раз на всё приложение
+        apply_theme(self)
 
         # Создаём и располагаем виджеты
         self._create_widgets()
 
-    def _setup_style(self):
-        """Настройка стиля для ttk-виджетов"""
-        style = ttk.Style(self)
-        try:
-            style.theme_use('clam')
-        except tk.TclError:
-            style.theme_use(style.theme_use())
-
-        # Стиль для поля вывода (Entry)
-        style.configure(
-            "Calculator.TEntry",
-            font=("Segoe UI", 20),
-            padding=15
-        )
-
-        # Стиль для кнопок
-        style.configure(
-            "Calculator.TButton",
-            font=("Segoe UI", 14),
-            padding=(10, 10)
-        )
+        # Ввод с клавиатуры идёт тем же путём, что и нажатия кнопок
+        self.bind("<Key>", self._on_key)
 
     def _create_widgets(self):
         """Создание и расположение всех виджетов окна"""
@@ -51,22 +51,33 @@ class CalculatorGUI(tk.Toplevel):
         # Адаптивность контейнера
         self.rowconfigure(0, weight=1)
         self.columnconfigure(0, weight=1)
-        container.rowconfigure(1, weight=1)
+        container.rowconfigure(2, weight=1)
         container.columnconfigure(0, weight=1)
 
-        # ---- Поле вывода ----
+        # ---- Поле вывода (только для чтения: ввод идёт через кнопки и клавиатуру) ----
         self.result_var = tk.StringVar(value="0")
         entry = ttk.Entry(
             container,
             textvariable=self.result_var,
             style="Calculator.TEntry",
-            justify="right"
+            justify="right",
+            state="readonly"
+        )
+        entry.grid(row=0, column=0, sticky="ew")
+
+        # ---- Предпросмотр результата под полем вывода ----
+        self.preview_var = tk.StringVar()
+        preview = ttk.Label(
+            container,
+            textvariable=self.preview_var,
+            style="Calculator.Preview.TLabel",
+            anchor="e"
         )
-        entry.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+        preview.grid(row=1, column=0, sticky="ew", pady=(2, 10))
 
         # ---- Сетка кнопок ----
         buttons_frame = ttk.Frame(container)
-        buttons_frame.grid(row=1, column=0, sticky="nsew")
+        buttons_frame.grid(row=2, column=0, sticky="nsew")
         for i in range(6):
             buttons_frame.rowconfigure(i, weight=1)
         for j in range(4):
@@ -78,7 +89,7 @@ class CalculatorGUI(tk.Toplevel):
             ('4', 2, 0), ('5', 2, 1), ('6', 2, 2), ('*', 2, 3),
             ('1', 3, 0), ('2', 3, 1), ('3', 3, 2), ('-', 3, 3),
             ('0', 4, 0), ('.', 4, 1), ('=', 4, 2), ('+', 4, 3),
-            ('C', 5, 0), ('^', 5, 3)
+            ('C', 5, 0), ('(', 5, 1), (')', 5, 2), ('^', 5, 3)
         ]
 
         for (text, row, col) in buttons:
@@ -90,25 +101,64 @@ class CalculatorGUI(tk.Toplevel):
             )
             btn.grid(row=row, column=col, sticky="nsew", padx=5, pady=5)
 
+    def _on_key(self, event):
+        """Обработка ввода с клавиатуры"""
+        if event.char and event.char in self.INPUT_CHARS:
+            self._on_button_click(event.char)
+        elif event.keysym in self.KEY_ACTIONS:
+            self._on_button_click(self.KEY_ACTIONS[event.keysym])
+
     def _on_button_click(self, char: str):
         """Обработка нажатия кнопок калькулятора"""
         if char == 'C':
-            self.current_expression = ""
-            self.result_var.set("0")
+            self._set_expression("")
+        elif char == '⌫':
+            self._set_expression(self.current_expression[:-1])
         elif char == '=':
+            self._cancel_preview()
             try:
                 result = self.calculator.calculate(self.current_expression)
                 if self.calculator.error_message:
                     self.result_var.set("Error")
                     messagebox.showerror("Ошибка", self.calculator.error_message)
                 else:
-                    self.result_var.set(str(result))
-                    self.current_expression = str(result)
+                    self._set_expression(str(result))
             except Exception:
                 self.result_var.set("Error")
         else:
             if self.current_expression == "0" or self.result_var.get() == "Error":
-                self.current_expression = char
+                self._set_expression(char)
             else:
-                self.current_expression += char
-            self.result_var.set(self.current_expression)
+                self._set_expression(self.current_expression + char)
+
+    def _set_expression(self, expression: str):
+        """Обновляет выражение и откладывает пересчёт предпросмотра"""
+        self.current_expression = expression
+        self.result_var.set(expression or "0")
+        self._cancel_preview()
+        self._preview_job = self.after(self.PREVIEW_DELAY_MS, self._update_preview)
+
+    def _cancel_preview(self):
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+            self._preview_job = None
+
+    def _update_preview(self):
+        """Пересчёт предпросмотра результата
+
+        Лексемы не меняющегося начала выражения переиспользуются,
+        заново разбирается только изменившийся хвост.
+        """
+        self._preview_job = None
+        try:
+            tokens = self._tokenizer.update(self.current_expression)
+        except ParseError:
+            self.preview_var.set("")
+            return
+
+        result = self.calculator.calculate_tokens(tokens) if tokens else None
+        # Незаконченное выражение при наборе — обычное дело, ошибку не показываем
+        if result is None or self.calculator.error_message:
+            self.preview_var.set("")
+        else:
+            self.preview_var.set(f"= {result}")
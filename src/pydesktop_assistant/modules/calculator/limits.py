@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+
+class CostLimitError(ValueError):
+    """Вычисление отклонено: превышены ограничения стоимости"""
+
+
+@dataclass
+class CostLimits:
+    """Ограничения стоимости вычислений
+
+    Размер результата возведения в степень и факториала оценивается
+    до вычисления, поэтому слишком большие выражения отклоняются сразу.
+    Ограничение по времени действует только в evaluate_many: при
+    вычислении одного значения (calculate, пакетный режим calc)
+    стоимость ограничивает оценка размера результата.
+    """
+    max_digits: int = 300  # цифр в целой части результата степени или факториала
+    max_seconds: float = 2.0  # время одного вызова evaluate_many
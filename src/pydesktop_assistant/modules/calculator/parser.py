@@ -0,0 +1,236 @@
+import re
+from dataclasses import dataclass
+from typing import Iterator, Union
+
+
+class ParseError(ValueError):
+    """Синтаксическая ошибка в выражении"""
+
+    def __init__(self, message: str, pos: int):
+        super().__init__(message)
+        self.pos = pos
+
+
+@dataclass(frozen=True)
+class Token:
+    """Лексема выражения"""
+    kind: str  # "number", "name", "op" или "end"
+    text: str
+    pos: int  # позиция первого символа в строке
+
+
+# ---- Узлы синтаксического дерева ----
+
+@dataclass(frozen=True)
+class Number:
+    value: float
+
+
+@dataclass(frozen=True)
+class Name:
+    name: str
+
+
+@dataclass(frozen=True)
+class UnaryOp:
+    op: str
+    operand: "Node"
+
+
+@dataclass(frozen=True)
+class BinOp:
+    op: str
+    left: "Node"
+    right: "Node"
+
+
+@dataclass(frozen=True)
+class Call:
+    name: str
+    args: tuple["Node", ...]
+
+
+Node = Union[Number, Name, UnaryOp, BinOp, Call]
+
+_TOKEN_RE = re.compile(r"""
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>\*\*|[-+*/^(),])
+""", re.VERBOSE)
+
+_SPACE_RE = re.compile(r"\s*")
+
+
+def tokenize(expression: str, start: int = 0) -> Iterator[Token]:
+    """Разбивает выражение на лексемы, начиная с позиции start
+
+    Последней всегда идёт лексема "end".
+    """
+    pos = _SPACE_RE.match(expression, start).end()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if match is None:
+            raise ParseError(f"Неожиданный символ '{expression[pos]}' в позиции {pos + 1}", pos)
+        yield Token(match.lastgroup, match.group(), pos)
+        pos = _SPACE_RE.match(expression, match.end()).end()
+    yield Token("end", "", pos)
+
+
+def parse(expression: str) -> Node:
+    """Строит синтаксическое дерево выражения"""
+    return _Parser(list(tokenize(expression))).parse()
+
+
+def parse_tokens(tokens: list[Token]) -> Node:
+    """Строит синтаксическое дерево по готовым лексемам (без "end")"""
+    end = tokens[-1].pos + len(tokens[-1].text) if tokens else 0
+    return _Parser([*tokens, Token("end", "", end)]).parse()
+
+
+class IncrementalTokenizer:
+    """Токенизация текста, который правят с конца (ввод с клавиатуры)
+
+    При каждом обновлении лексемы общего со старым текстом префикса
+    переиспользуются, заново разбирается только хвост, начиная
+    с последней лексемы, которую изменение могло затронуть.
+    """
+
+    # Сколько символов после конца лексемы может просмотреть регулярное
+    # выражение (экспонента числа: "2" -> "2e+5")
+    LOOKAHEAD = 3
+
+    def __init__(self):
+        self.text = ""
+        self.tokens = []  # лексемы текущего текста без "end"
+        self.reused = 0  # сколько лексем переиспользовано при последнем обновлении
+
+    def update(self, text: str) -> list[Token]:
+        """Лексемы нового текста"""
+        prefix = 0
+        limit = min(len(text), len(self.text))
+        while prefix < limit and text[prefix] == self.text[prefix]:
+            prefix += 1
+
+        # Лексема стабильна, если и она сама, и символы, которые
+        # регулярное выражение могло просмотреть после неё, не изменились
+        stable = 0
+        while (
+            stable < len(self.tokens)
+            and self._end(self.tokens[stable]) + self.LOOKAHEAD <= prefix
+        ):
+            stable += 1
+        start = self._end(self.tokens[stable - 1]) if stable else 0
+
+        try:
+            tail = [token for token in tokenize(text, start) if token.kind != "end"]
+        except ParseError:
+            self.text, self.tokens = "", []
+            raise
+
+        self.tokens = self.tokens[:stable] + tail
+        self.text = text
+        self.reused = stable
+        return list(self.tokens)
+
+    @staticmethod
+    def _end(token: Token) -> int:
+        return token.pos + len(token.text)
+
+
+class _Parser:
+    """Парсер рекурсивного спуска
+
+    Грамматика (от низшего приоритета к высшему):
+        expr    := term (("+" | "-") term)*
+        term    := unary (("*" | "/") unary)*
+        unary   := ("+" | "-") unary | power
+        power   := primary (("^" | "**") unary)?     правоассоциативно
+        primary := NUMBER | NAME | NAME "(" args ")" | "(" expr ")"
+    """
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.index = 0
+
+    @property
+    def current(self) -> Token:
+        return self.tokens[self.index]
+
+    def parse(self) -> Node:
+        if self.current.kind == "end":
+            raise ParseError("Не удалось распознать выражение", 0)
+        node = self._expr()
+        if self.current.kind != "end":
+            self._unexpected()
+        return node
+
+    def _accept(self, *ops: str) -> str | None:
+        """Забирает текущую лексему, если это один из операторов ops"""
+        token = self.current
+        if token.kind == "op" and token.text in ops:
+            self.index += 1
+            return token.text
+        return None
+
+    def _expect(self, op: str):
+        if self._accept(op) is None:
+            if self.current.kind == "end":
+                raise ParseError(f"Ожидалась '{op}' в конце выражения", self.current.pos)
+            raise ParseError(f"Ожидалась '{op}' в позиции {self.current.pos + 1}", self.current.pos)
+
+    def _unexpected(self):
+        token = self.current
+        if token.kind == "end":
+            raise ParseError("Неожиданный конец выражения", token.pos)
+        raise ParseError(f"Неожиданный символ '{token.text}' в позиции {token.pos + 1}", token.pos)
+
+    def _expr(self) -> Node:
+        node = self._term()
+        while (op := self._accept("+", "-")) is not None:
+            node = BinOp(op, node, self._term())
+        return node
+
+    def _term(self) -> Node:
+        node = self._unary()
+        while (op := self._accept("*", "/")) is not None:
+            node = BinOp(op, node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        op = self._accept("+", "-")
+        if op is not None:
+            return UnaryOp(op, self._unary())
+        return self._power()
+
+    def _power(self) -> Node:
+        node = self._primary()
+        op = self._accept("^", "**")
+        if op is not None:
+            # Правая часть разбирается через _unary: 2^-1 и 2^3^2 = 2^(3^2)
+            node = BinOp(op, node, self._unary())
+        return node
+
+    def _primary(self) -> Node:
+        token = self.current
+        if token.kind == "number":
+            self.index += 1
+            return Number(float(token.text))
+
+        if token.kind == "name":
+            self.index += 1
+            if self._accept("(") is None:
+                return Name(token.text)
+            args = []
+            if self._accept(")") is None:
+                args.append(self._expr())
+                while self._accept(",") is not None:
+                    args.append(self._expr())
+                self._expect(")")
+            return Call(token.text, tuple(args))
+
+        if self._accept("(") is not None:
+            node = self._expr()
+            self._expect(")")
+            return node
+
+        self._unexpected()
@@ -1,10 +1,14 @@
-import sqlite3
+import heapq
+import itertools
 import threading
-import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass
-from plyer import notification
+from typing import Iterable, Iterator
+from ...notifications import NotificationDispatcher
+from ...storage.database import Database
+from ...storage.id_allocator import FreeIdAllocator
 
 
 @dataclass
@@ -19,16 +23,36 @@ class CalendarEvent:
 class CalendarManager:
     """Менеджер календарных событий с уведомлениями"""
 
-    def __init__(self, db_path: str = "calendar.db"):
+    # Максимальное время сна планировщика, с: страховка от перевода
+    # системных часов и выхода из спящего режима
+    MAX_SLEEP = 300
+    # Сколько месяцев держать в кеше get_events_for_month()
+    MONTH_CACHE_SIZE = 12
+
+    _COLUMNS = "id, title, description, event_datetime, notified"
+
+    def __init__(self, db_path: str = "calendar.db", notifier: NotificationDispatcher | None = None):
+        self.notifier = notifier or NotificationDispatcher.shared()
         self.db_path = Path(db_path)
-        self.events = []
+        self.db = Database.shared(self.db_path)
+        self._ids = FreeIdAllocator("events")
+        # LRU-кеш событий по месяцам: (год, месяц) -> список событий
+        self._month_cache = OrderedDict()
+        self._cache_generation = 0  # растёт при каждом сбросе кеша
+        self._cache_lock = threading.Lock()
+        # Куча (дата, порядковый номер, событие) ещё не уведомлённых событий.
+        # Удалённые события не вынимаются из кучи, а пропускаются при извлечении.
+        self._due = []
+        self._due_counter = itertools.count()
+        self._pending = {}  # id -> событие, ожидающее уведомления
+        self._wakeup = threading.Condition()
         self._init_db()
         self._load_events()
         self._start_notification_thread()
 
     def _init_db(self):
         """Инициализация базы данных"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS events (
                     id INTEGER PRIMARY KEY,
@@ -38,62 +62,192 @@ class CalendarManager:
                     notified BOOLEAN DEFAULT FALSE
                 )
             """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_datetime ON events (event_datetime)"
+            )
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_events_pending
+                ON events (event_datetime) WHERE NOT notified
+            """)
+            self._ids.install(conn)
 
     def _load_events(self):
-        """Загрузка событий из базы данных"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, title, description, event_datetime, notified FROM events")
-            self.events = [
-                CalendarEvent(
-                    id=row[0],
-                    title=row[1],
-                    description=row[2],
-                    event_datetime=datetime.fromisoformat(row[3]),
-                    notified=bool(row[4])
-                ) for row in cursor.fetchall()
-            ]
+        """Загрузка в планировщик событий, ожидающих уведомления
+
+        Уже уведомлённая история в память не загружается.
+        """
+        cursor = self.db.execute(
+            f"SELECT {self._COLUMNS} FROM events WHERE NOT notified ORDER BY event_datetime"
+        )
+        with self._wakeup:
+            for row in cursor:
+                self._schedule(self._row_to_event(row))
+
+    def iter_events(self, chunk_size: int = 500) -> Iterator[CalendarEvent]:
+        """Потоковый обход событий из БД по возрастанию ID порциями"""
+        rows = self.db.iter_keyset(
+            f"SELECT {self._COLUMNS} FROM events WHERE id > ? ORDER BY id LIMIT ?",
+            chunk_size=chunk_size
+        )
+        for row in rows:
+            yield self._row_to_event(row)
+
+    @staticmethod
+    def _row_to_event(row: tuple) -> CalendarEvent:
+        """Преобразование строки таблицы events в CalendarEvent"""
+        return CalendarEvent(
+            id=row[0],
+            title=row[1],
+            description=row[2],
+            event_datetime=datetime.fromisoformat(row[3]),
+            notified=bool(row[4])
+        )
 
     def add_event(self, title: str, description: str, event_datetime: datetime) -> CalendarEvent:
         """Добавление нового события"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        return self.add_events([(title, description, event_datetime)])[0]
 
-            # Поиск минимального доступного ID
-            cursor.execute("SELECT id FROM events ORDER BY id")
-            existing_ids = {row[0] for row in cursor.fetchall()}
-            event_id = 1
-            while event_id in existing_ids:
-                event_id += 1
+    def add_events(self, events: Iterable[tuple[str, str, datetime]]) -> list[CalendarEvent]:
+        """Пакетное добавление событий (название, описание, дата) в одной транзакции"""
+        events = list(events)
+        if not events:
+            return []
 
-            cursor.execute(
+        with self.db.transaction() as conn:
+            # Поиск минимальных доступных ID сразу для всей пачки
+            event_ids = self._ids.allocate(conn, len(events))
+            conn.executemany(
                 """
                 INSERT INTO events (id, title, description, event_datetime)
                 VALUES (?, ?, ?, ?)
                 """,
-                (event_id, title, description, event_datetime.isoformat())
+                [
+                    (event_id, title, description, event_datetime.isoformat())
+                    for event_id, (title, description, event_datetime) in zip(event_ids, events)
+                ]
             )
 
-            event = CalendarEvent(
+        new_events = [
+            CalendarEvent(
                 id=event_id,
                 title=title,
                 description=description,
                 event_datetime=event_datetime
-            )
-            self.events.append(event)
-            return event
+            ) for event_id, (title, description, event_datetime) in zip(event_ids, events)
+        ]
+        self._invalidate_months(e.event_datetime for e in new_events)
+
+        with self._wakeup:
+            earliest = self._due[0][0] if self._due else None
+            for event in new_events:
+                self._schedule(event)
+            # Будим поток, только если изменилось ближайшее событие
+            if earliest is None or self._due[0][0] < earliest:
+                self._wakeup.notify()
+        return new_events
 
     def delete_event(self, event_id: int):
         """Удаление события по ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+        self.delete_many([event_id])
+
+    def delete_many(self, event_ids: Iterable[int]):
+        """Пакетное удаление событий в одной транзакции"""
+        event_ids = set(event_ids)
+        with self.db.transaction() as conn:
+            # Запоминаем даты, чтобы сбросить кеш только затронутых месяцев
+            dates = [
+                datetime.fromisoformat(row[0])
+                for event_id in event_ids
+                for row in conn.execute(
+                    "SELECT event_datetime FROM events WHERE id = ?", (event_id,)
+                )
+            ]
+            conn.executemany(
+                "DELETE FROM events WHERE id = ?",
+                [(event_id,) for event_id in event_ids]
+            )
 
         # Удаление из кеша
-        self.events = [e for e in self.events if e.id != event_id]
+        self._invalidate_months(dates)
+
+        with self._wakeup:
+            head = self._due[0][2] if self._due else None
+            for event_id in event_ids:
+                self._pending.pop(event_id, None)
+            if head is not None and head.id in event_ids:
+                self._wakeup.notify()
 
     def get_all_events(self) -> list[CalendarEvent]:
         """Получение всех событий, отсортированных по дате"""
-        return sorted(self.events, key=lambda e: e.event_datetime)
+        cursor = self.db.execute(
+            f"SELECT {self._COLUMNS} FROM events ORDER BY event_datetime, id"
+        )
+        return [self._row_to_event(row) for row in cursor.fetchall()]
+
+    def get_events_between(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """События в интервале start <= дата < end, отсортированные по дате"""
+        cursor = self.db.execute(
+            f"""
+            SELECT {self._COLUMNS} FROM events
+            WHERE event_datetime >= ? AND event_datetime < ?
+            ORDER BY event_datetime, id
+            """,
+            (start.isoformat(), end.isoformat())
+        )
+        return [self._row_to_event(row) for row in cursor.fetchall()]
+
+    def get_events_for_month(self, year: int, month: int) -> list[CalendarEvent]:
+        """События месяца с кешированием последних просмотренных месяцев"""
+        key = (year, month)
+        with self._cache_lock:
+            events = self._month_cache.get(key)
+            if events is not None:
+                self._month_cache.move_to_end(key)
+                return list(events)
+            generation = self._cache_generation
+
+        start = datetime(year, month, 1)
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+        events = self.get_events_between(start, end)
+
+        with self._cache_lock:
+            # Если кеш сбросили во время чтения, результат мог устареть
+            if generation != self._cache_generation:
+                return events
+            self._month_cache[key] = events
+            while len(self._month_cache) > self.MONTH_CACHE_SIZE:
+                self._month_cache.popitem(last=False)
+        return list(events)
+
+    def _invalidate_months(self, dates: Iterable[datetime]):
+        """Сбрасывает кеш месяцев, в которые попадают даты"""
+        with self._cache_lock:
+            self._cache_generation += 1
+            for date in dates:
+                self._month_cache.pop((date.year, date.month), None)
+
+    def _schedule(self, event: CalendarEvent):
+        """Добавляет событие в очередь уведомлений (под self._wakeup)"""
+        self._pending[event.id] = event
+        heapq.heappush(self._due, (event.event_datetime, next(self._due_counter), event))
+
+    def _pop_due_events(self, now: datetime) -> list[CalendarEvent]:
+        """Извлекает наступившие события из кучи (под self._wakeup)"""
+        due_events = []
+        while self._due and self._due[0][0] <= now:
+            _, _, event = heapq.heappop(self._due)
+            # Пропускаем удалённые события (ленивое удаление)
+            if self._pending.get(event.id) is event:
+                del self._pending[event.id]
+                due_events.append(event)
+        return due_events
+
+    def _next_timeout(self, now: datetime) -> float | None:
+        """Сколько спать до ближайшего события (под self._wakeup)"""
+        if not self._due:
+            return None
+        seconds = (self._due[0][0] - now).total_seconds()
+        return min(max(seconds, 0.0), self.MAX_SLEEP)
 
     def _start_notification_thread(self):
         """Запуск фонового потока для проверки событий"""
@@ -103,39 +257,46 @@ class CalendarManager:
 
     def stop_notifications(self):
         """Остановка фонового потока"""
-        self.running = False
+        with self._wakeup:
+            self.running = False
+            self._wakeup.notify()
         if self.thread.is_alive():
             self.thread.join(timeout=1.0)
 
     def _check_events(self):
-        """Проверка событий и отправка уведомлений"""
-        while self.running:
-            now = datetime.now()
+        """Ожидание ближайшего события и отправка уведомлений"""
+        while True:
+            with self._wakeup:
+                if not self.running:
+                    return
+                now = datetime.now()
+                due_events = self._pop_due_events(now)
+                if not due_events:
+                    # Спим ровно до ближайшего события или до изменения очереди
+                    self._wakeup.wait(self._next_timeout(now))
+                    continue
 
-            for event in self.events:
-                if not event.notified and event.event_datetime <= now:
-                    self._send_notification(event)
-                    event.notified = True
-                    self._mark_as_notified(event.id)
-
-            time.sleep(30)  # Проверка каждые 30 секунд
+            # Уведомления ставим в очередь вне блокировки
+            for event in due_events:
+                self._send_notification(event)
+                event.notified = True
+                self._mark_as_notified(event)
+                self._invalidate_months([event.event_datetime])
 
     def _send_notification(self, event: CalendarEvent):
-        """Отправка системного уведомления"""
-        try:
-            notification.notify(
-                title=f"Событие: {event.title}",
-                message=event.description,
-                app_name="PyDesktop Assistant",
-                timeout=10
-            )
-        except Exception as e:
-            print(f"Ошибка отправки уведомления: {e}")
+        """Постановка системного уведомления в очередь"""
+        self.notifier.notify(f"Событие: {event.title}", event.description)
+
+    def _mark_as_notified(self, event: CalendarEvent):
+        """Помечает событие как уведомлённое в БД
 
-    def _mark_as_notified(self, event_id: int):
-        """Помечает событие как уведомлённое в БД"""
-        with sqlite3.connect(self.db_path) as conn:
+        Отметка ставится вне блокировки: за это время событие могут
+        удалить, а его ID — выдать новому событию. Поэтому строка
+        сверяется ещё и по времени события, иначе новое событие
+        оказалось бы помечено, так и не показавшись.
+        """
+        with self.db.transaction() as conn:
             conn.execute(
-                "UPDATE events SET notified = TRUE WHERE id = ?",
-                (event_id,)
+                "UPDATE events SET notified = TRUE WHERE id = ? AND event_datetime = ?",
+                (event.id, event.event_datetime.isoformat())
             )
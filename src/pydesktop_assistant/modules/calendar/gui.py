@@ -3,69 +3,36 @@ from tkinter import ttk, messagebox
 from tkcalendar import Calendar
 import datetime
 from .calendar import CalendarManager
+from ...gui.background import BackgroundExecutor
+from ...gui.virtual_list import VirtualList
+from ...gui.theme import apply_theme
 
 
 class CalendarGUI(tk.Toplevel):
     """Окно управления календарём"""
 
-    def __init__(self, master=None):
+    def __init__(self, master=None, services=None):
         super().__init__(master)
         self.title("Календарь событий")
         self.geometry("650x950")
         self.minsize(600, 700)
 
-        # Инициализируем менеджер событий
-        self.calendar_manager = CalendarManager()
+        # Менеджер событий общий для всего приложения (см. ServiceRegistry);
+        # без реестра окно создаёт собственный
+        self.calendar_manager = services.calendar if services is not None else CalendarManager()
+        # Запросы к БД выполняются в фоне, чтобы не блокировать интерфейс
+        self.io = BackgroundExecutor(self, services.io_pool if services is not None else None)
+        self._month_events = []  # события отображаемого месяца
 
-        # Настраиваем стили
-        self._setup_style()
+        # Тема и стили применяются один раз на всё приложение
+        apply_theme(self)
 
         # Создаём все виджеты
         self._create_widgets()
 
         # Заполняем список текущими событиями
         self._refresh_events_list()
-
-    def _setup_style(self):
-        """Настройка стиля для ttk-виджетов"""
-        style = ttk.Style(self)
-        try:
-            style.theme_use('clam')
-        except tk.TclError:
-            style.theme_use(style.theme_use())
-
-        # Стиль для заголовка в LabelFrame
-        style.configure(
-            "TLabelframe.Label",
-            font=("Segoe UI", 12, "bold"),
-            foreground="#444444"
-        )
-
-        # Стиль для обычных меток
-        style.configure(
-            "TLabel",
-            font=("Segoe UI", 10),
-            foreground="#333333"
-        )
-
-        # Стиль для кнопок
-        style.configure(
-            "TButton",
-            font=("Segoe UI", 11),
-            padding=(8, 4)
-        )
-
-        # Стиль для элементов Treeview
-        style.configure(
-            "Treeview.Heading",
-            font=("Segoe UI", 10, "bold"),
-            foreground="#222222"
-        )
-        style.configure(
-            "Treeview",
-            font=("Segoe UI", 10),
-            rowheight=24
-        )
+        self.bind("<Destroy>", self._on_destroy)
 
     def _create_widgets(self):
         """Создаём и размещаем все виджеты окна"""
@@ -83,8 +50,7 @@ class CalendarGUI(tk.Toplevel):
         header = ttk.Label(
             container,
             text="Календарь событий",
-            font=("Segoe UI", 16, "bold"),
-            foreground="#2E4053"
+            style="Header.TLabel"
         )
         header.grid(row=0, column=0, pady=(0, 15))
 
@@ -101,6 +67,8 @@ class CalendarGUI(tk.Toplevel):
         )
         self.calendar.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         self.calendar.bind("<<CalendarSelected>>", self._date_selected)
+        # При листании календаря загружаем события только видимого месяца
+        self.calendar.bind("<<CalendarMonthChanged>>", lambda e: self._refresh_events_list())
 
         # ---- Средняя часть: Форма добавления события ----
         form_frame = ttk.LabelFrame(container, text="Добавить новое событие")
@@ -139,17 +107,18 @@ class CalendarGUI(tk.Toplevel):
         add_btn.grid(row=3, column=1, sticky="e", padx=5, pady=(10, 5))
 
         # ---- Нижняя часть: Список/таблица событий ----
-        events_frame = ttk.LabelFrame(container, text="Список предстоящих событий")
+        events_frame = ttk.LabelFrame(container, text="События месяца")
         events_frame.grid(row=3, column=0, sticky="nsew", pady=(0, 10))
         events_frame.rowconfigure(0, weight=1)
         events_frame.columnconfigure(0, weight=1)
 
+        # Виртуальная таблица: отрисовываются только видимые строки
         columns = ("id", "date", "time", "title", "description")
-        self.events_list = ttk.Treeview(
+        self.events_list = VirtualList(
             events_frame,
             columns=columns,
-            show="headings",
-            selectmode="browse",
+            count=lambda: len(self._month_events),
+            fetch=self._fetch_events,
             height=12
         )
 
@@ -166,14 +135,7 @@ class CalendarGUI(tk.Toplevel):
         self.events_list.column("title", width=180)
         self.events_list.column("description", width=250)
 
-        # Вертикальный скролл
-        scroll_y = ttk.Scrollbar(
-            events_frame, orient="vertical", command=self.events_list.yview
-        )
-        self.events_list.configure(yscrollcommand=scroll_y.set)
-
-        self.events_list.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
-        scroll_y.grid(row=0, column=1, sticky="ns", padx=(0, 5), pady=5)
+        self.events_list.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
 
         # Кнопка удаления ниже таблицы
         delete_btn = ttk.Button(
@@ -207,9 +169,11 @@ class CalendarGUI(tk.Toplevel):
                 messagebox.showerror("Ошибка", "Нельзя добавлять события в прошлом!")
                 return
 
-            # Добавляем событие в менеджер
-            self.calendar_manager.add_event(title, description, event_datetime)
-            self._refresh_events_list()
+            # Добавляем событие в фоне и обновляем таблицу, когда запись готова
+            self.io.submit(
+                self.calendar_manager.add_event, title, description, event_datetime,
+                on_success=lambda event: self._refresh_events_list()
+            )
 
             # Очищаем поля
             self.title_entry.delete(0, tk.END)
@@ -224,35 +188,52 @@ class CalendarGUI(tk.Toplevel):
 
     def _delete_event(self):
         """Удаление выбранного события из таблицы и БД"""
-        selected = self.events_list.selection()
-        if not selected:
+        # Получаем ID выбранной строки
+        event_id = self.events_list.selected_key()
+        if event_id is None:
             messagebox.showerror("Ошибка", "Выберите событие для удаления!")
             return
 
-        # Получаем ID из выбранной строки
-        event_id = int(self.events_list.item(selected[0], "values")[0])
-        self.calendar_manager.delete_event(event_id)
-        self._refresh_events_list()
+        self.events_list.clear_selection()
+        self.io.submit(
+            self.calendar_manager.delete_event, event_id,
+            on_success=lambda _: self._refresh_events_list()
+        )
 
     def _refresh_events_list(self):
         """Обновление списка (таблицы) событий"""
-        # Удаляем всё из текущей таблицы
-        for item in self.events_list.get_children():
-            self.events_list.delete(item)
+        # Загружаем события отображаемого месяца в фоне
+        month, year = self.calendar.get_displayed_month()
+        self.io.submit(
+            self.calendar_manager.get_events_for_month, year, month,
+            on_success=lambda events: self._show_month_events((month, year), events)
+        )
 
-        # Заполняем новыми значениями
-        for event in self.calendar_manager.get_all_events():
+    def _show_month_events(self, displayed: tuple[int, int], events: list):
+        """Показывает загруженные события, если месяц ещё на экране"""
+        if displayed != self.calendar.get_displayed_month():
+            return  # пользователь уже перелистнул календарь
+        self._month_events = events
+        self.events_list.refresh()
+
+    def _fetch_events(self, offset: int, limit: int) -> list:
+        """Страница строк таблицы: (ключ, values, tags)"""
+        rows = []
+        for event in self._month_events[offset:offset + limit]:
             event_date = event.event_datetime.strftime("%d.%m.%Y")
             event_time = event.event_datetime.strftime("%H:%M")
 
-            self.events_list.insert(
-                "",
-                tk.END,
-                values=(
-                    event.id,
-                    event_date,
-                    event_time,
-                    event.title,
-                    event.description
-                )
+            values = (
+                event.id,
+                event_date,
+                event_time,
+                event.title,
+                event.description
             )
+            rows.append((event.id, values, ()))
+        return rows
+
+    def _on_destroy(self, event):
+        """Окно закрыто — прекращаем фоновые запросы"""
+        if event.widget is self:
+            self.io.shutdown()
@@ -1,69 +1,40 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from .notes import NoteManager
+from ...gui.background import BackgroundExecutor
+from ...gui.virtual_list import VirtualList
+from ...gui.theme import apply_theme
 
 
 class NotesGUI(tk.Toplevel):
     """Окно управления заметками"""
 
-    def __init__(self, master=None):
+    # Задержка поиска после последнего нажатия клавиши, мс
+    SEARCH_DELAY_MS = 250
+
+    def __init__(self, master=None, services=None):
         super().__init__(master)
         self.title("Заметки")
         self.geometry("650x450")
         self.minsize(600, 400)
 
-        # Инициализируем менеджер заметок
-        self.note_manager = NoteManager()
+        # Менеджер заметок общий для всего приложения (см. ServiceRegistry);
+        # без реестра окно создаёт собственный
+        self.note_manager = services.notes if services is not None else NoteManager()
+        # Запросы к БД выполняются в фоне, чтобы не блокировать интерфейс
+        self.io = BackgroundExecutor(self, services.io_pool if services is not None else None)
+        self._search_job = None
+        self._query = ""  # поисковый запрос, по которому построена таблица
 
-        # Настраиваем стили
-        self._setup_style()
+        # Тема и стили применяются один раз на всё приложение
+        apply_theme(self)
 
         # Создаём и размещаем виджеты
         self._create_widgets()
 
         # Заполняем таблицу текущими заметками
         self._refresh_notes_list()
-
-    def _setup_style(self):
-        """Настройка стиля для ttk-виджетов"""
-        style = ttk.Style(self)
-        try:
-            style.theme_use('clam')
-        except tk.TclError:
-            style.theme_use(style.theme_use())
-
-        # Стиль для заголовков LabelFrame
-        style.configure(
-            "TLabelframe.Label",
-            font=("Segoe UI", 12, "bold"),
-            foreground="#444444"
-        )
-
-        # Стиль для меток
-        style.configure(
-            "TLabel",
-            font=("Segoe UI", 10),
-            foreground="#333333"
-        )
-
-        # Стиль для кнопок
-        style.configure(
-            "TButton",
-            font=("Segoe UI", 11),
-            padding=(8, 4)
-        )
-
-        # Стиль для Treeview
-        style.configure(
-            "Treeview.Heading",
-            font=("Segoe UI", 10, "bold"),
-            foreground="#222222"
-        )
-        style.configure(
-            "Treeview",
-            font=("Segoe UI", 10),
-            rowheight=24
-        )
+        self.bind("<Destroy>", self._on_destroy)
 
     def _create_widgets(self):
         """Создание и расположение всех виджетов окна"""
@@ -81,8 +52,7 @@ class NotesGUI(tk.Toplevel):
         header = ttk.Label(
             container,
             text="Менеджер заметок",
-            font=("Segoe UI", 16, "bold"),
-            foreground="#2E4053"
+            style="Header.TLabel"
         )
         header.grid(row=0, column=0, pady=(0, 15))
 
@@ -116,16 +86,29 @@ class NotesGUI(tk.Toplevel):
         # ---- Нижняя часть: Список заметок ----
         notes_frame = ttk.LabelFrame(container, text="Список заметок")
         notes_frame.grid(row=2, column=0, sticky="nsew")
-        notes_frame.rowconfigure(0, weight=1)
+        notes_frame.rowconfigure(1, weight=1)
         notes_frame.columnconfigure(0, weight=1)
 
+        # Строка поиска над таблицей
+        search_frame = ttk.Frame(notes_frame)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=(5, 0))
+        search_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(search_frame, text="Поиск:").grid(row=0, column=0, sticky="w")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+        search_entry.bind("<KeyRelease>", self._on_search_changed)
+
+        # Виртуальная таблица: строки подгружаются страницами при прокрутке
         columns = ("id", "title", "content")
-        self.notes_list = ttk.Treeview(
+        self.notes_list = VirtualList(
             notes_frame,
             columns=columns,
-            show="headings",
-            selectmode="browse",
-            height=12
+            count=self._count_notes,
+            fetch=self._fetch_notes,
+            height=12,
+            executor=self.io
         )
 
         # Заголовки и настройки колонок
@@ -137,14 +120,7 @@ class NotesGUI(tk.Toplevel):
         self.notes_list.column("title", width=200)
         self.notes_list.column("content", width=330)
 
-        # Вертикальный скроллбар
-        scroll_y = ttk.Scrollbar(
-            notes_frame, orient="vertical", command=self.notes_list.yview
-        )
-        self.notes_list.configure(yscrollcommand=scroll_y.set)
-
-        self.notes_list.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
-        scroll_y.grid(row=0, column=1, sticky="ns", padx=(0, 5), pady=5)
+        self.notes_list.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
 
         # ---- Кнопка удаления заметки ----
         delete_btn = ttk.Button(
@@ -156,17 +132,38 @@ class NotesGUI(tk.Toplevel):
 
     def _refresh_notes_list(self):
         """Обновление списка заметок в таблице"""
-        # Удаляем все элементы из Treeview
-        for item in self.notes_list.get_children():
-            self.notes_list.delete(item)
-
-        # Заполняем новыми данными
-        for note in self.note_manager.get_all_notes():
-            self.notes_list.insert(
-                "",
-                tk.END,
-                values=(note.id, note.title, note.content)
-            )
+        self._query = self.search_var.get().strip()
+        self.notes_list.refresh()
+
+    def _count_notes(self) -> int:
+        """Количество строк таблицы: найденные или все заметки"""
+        if self._query:
+            return self.note_manager.search_count(self._query)
+        return self.note_manager.count_notes()
+
+    def _fetch_notes(self, offset: int, limit: int) -> list:
+        """Страница строк таблицы: (ключ, values, tags)"""
+        if self._query:
+            # Результаты поиска: подсвеченные фрагменты вместо полного текста
+            return [
+                (result.note.id, (result.note.id, result.title_snippet, result.content_snippet), ())
+                for result in self.note_manager.search(self._query, limit=limit, offset=offset)
+            ]
+        return [
+            (note.id, (note.id, note.title, note.content), ())
+            for note in self.note_manager.get_notes_page(offset, limit)
+        ]
+
+    def _on_search_changed(self, event=None):
+        """Перезапуск поиска с задержкой, чтобы не искать на каждую букву"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        """Выполнение отложенного поиска"""
+        self._search_job = None
+        self._refresh_notes_list()
 
     def _add_note(self):
         """Обработка добавления новой заметки"""
@@ -177,23 +174,30 @@ class NotesGUI(tk.Toplevel):
             messagebox.showerror("Ошибка", "Заполните все поля!")
             return
 
-        # Создаём заметку в менеджере
-        self.note_manager.create_note(title, content)
+        # Создаём заметку в фоне и обновляем таблицу, когда запись готова
+        self.io.submit(
+            self.note_manager.create_note, title, content,
+            on_success=lambda note: self._refresh_notes_list()
+        )
 
         # Очищаем поля ввода
         self.title_entry.delete(0, tk.END)
         self.content_entry.delete(0, tk.END)
 
-        # Обновляем таблицу
-        self._refresh_notes_list()
-
     def _delete_note(self):
         """Обработка удаления выбранной заметки"""
-        selected = self.notes_list.selection()
-        if not selected:
+        note_id = self.notes_list.selected_key()
+        if note_id is None:
             messagebox.showerror("Ошибка", "Выберите заметку для удаления!")
             return
 
-        note_id = self.notes_list.item(selected[0], "values")[0]
-        self.note_manager.delete_note(note_id)
-        self._refresh_notes_list()
+        self.notes_list.clear_selection()
+        self.io.submit(
+            self.note_manager.delete_note, note_id,
+            on_success=lambda _: self._refresh_notes_list()
+        )
+
+    def _on_destroy(self, event):
+        """Окно закрыто — прекращаем фоновые запросы"""
+        if event.widget is self:
+            self.io.shutdown()
@@ -1,6 +1,9 @@
 import sqlite3
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Iterable, Iterator
+from ...storage.database import Database
+from ...storage.id_allocator import FreeIdAllocator
 
 
 @dataclass
@@ -10,16 +13,34 @@ class Note:
     content: str
 
 
+@dataclass
+class NoteSearchResult:
+    note: Note
+    title_snippet: str
+    content_snippet: str
+    rank: float
+
+
 class NoteManager:
     """Менеджер заметок с использованием SQLite"""
 
+    # Маркеры подсветки совпадений в результатах поиска
+    HIGHLIGHT_START = "["
+    HIGHLIGHT_END = "]"
+    # Слова короче этого ищутся целиком, а не как префикс: префикс
+    # из одной буквы совпадает почти со всеми заметками
+    MIN_PREFIX_LENGTH = 2
+
     def __init__(self, db_path: str = "notes.db"):
         self.db_path = Path(db_path)
+        self.db = Database.shared(self.db_path)
+        self._ids = FreeIdAllocator("notes")
+        self.fts_enabled = True
         self._init_db()
 
     def _init_db(self):
         """Инициализация базы данных"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS notes (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -27,44 +48,217 @@ class NoteManager:
                     content TEXT NOT NULL
                 )
             """)
+            self._ids.install(conn)
+            self._init_fts(conn)
+
+    def _init_fts(self, conn: sqlite3.Connection):
+        """Полнотекстовый индекс FTS5, синхронизируемый триггерами
+
+        Индекс префиксов из 2 и 3 символов ускоряет поиск по коротким
+        префиксам. Индекс, созданный без него, пересоздаётся.
+        """
+        existing = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'"
+        ).fetchone()
+        if existing:
+            if "prefix" in existing[0]:
+                return
+            conn.execute("DROP TABLE notes_fts")
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER IF EXISTS notes_fts_{trigger}")
+
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE notes_fts USING fts5(
+                    title, content, content='notes', content_rowid='id', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            # SQLite собран без FTS5 — поиск будет работать через LIKE
+            self.fts_enabled = False
+            return
+
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes
+            BEGIN
+                INSERT INTO notes_fts (rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes
+            BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE ON notes
+            BEGIN
+                INSERT INTO notes_fts (notes_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO notes_fts (rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+        """)
+
+        # Совпадения в заголовке весят больше, чем в тексте
+        conn.execute("INSERT INTO notes_fts (notes_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)')")
+        # Индексируем заметки, созданные до появления FTS
+        conn.execute("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')")
 
     def create_note(self, title: str, content: str) -> Note:
         """Создание заметки с минимальным доступным ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            note_id = self._get_available_id()
+        return self.create_notes([(title, content)])[0]
 
-            cursor.execute(
+    def create_notes(self, notes: Iterable[tuple[str, str]]) -> list[Note]:
+        """Пакетное создание заметок (заголовок, текст) в одной транзакции"""
+        notes = list(notes)
+        if not notes:
+            return []
+
+        with self.db.transaction() as conn:
+            # ID для всей пачки выдаём за один проход
+            note_ids = self._ids.allocate(conn, len(notes))
+            conn.executemany(
                 "INSERT INTO notes (id, title, content) VALUES (?, ?, ?)",
-                (note_id, title, content)
+                [(note_id, title, content) for note_id, (title, content) in zip(note_ids, notes)]
             )
-            return Note(id=note_id, title=title, content=content)
+        return [
+            Note(id=note_id, title=title, content=content)
+            for note_id, (title, content) in zip(note_ids, notes)
+        ]
 
     def delete_note(self, note_id: int):
         """Удаление заметки по ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        self.delete_many([note_id])
+
+    def delete_many(self, note_ids: Iterable[int]):
+        """Пакетное удаление заметок в одной транзакции"""
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "DELETE FROM notes WHERE id = ?",
+                [(note_id,) for note_id in note_ids]
+            )
 
     def get_all_notes(self) -> list[Note]:
         """Получение всех заметок"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, title, content FROM notes")
-            return [Note(*row) for row in cursor.fetchall()]
-
-    def _get_available_id(self) -> int:
-        """Находит минимальный доступный ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Получаем все существующие ID
-            cursor.execute("SELECT id FROM notes ORDER BY id")
-            existing_ids = [row[0] for row in cursor.fetchall()]
-
-            # Ищем первую "дыру" в последовательности
-            expected_id = 1
-            for id in existing_ids:
-                if id > expected_id:
-                    return expected_id
-                expected_id = id + 1
-            return expected_id
+        return list(self.iter_notes())
+
+    def iter_notes(self, chunk_size: int = 500) -> Iterator[Note]:
+        """Потоковый обход заметок по возрастанию ID порциями"""
+        rows = self.db.iter_keyset(
+            "SELECT id, title, content FROM notes WHERE id > ? ORDER BY id LIMIT ?",
+            chunk_size=chunk_size
+        )
+        for row in rows:
+            yield Note(*row)
+
+    def count_notes(self) -> int:
+        """Количество заметок"""
+        return self.db.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def get_notes_page(self, offset: int, limit: int) -> list[Note]:
+        """Страница заметок по возрастанию ID (для постраничного отображения)"""
+        cursor = self.db.execute(
+            "SELECT id, title, content FROM notes ORDER BY id LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+        return [Note(*row) for row in cursor.fetchall()]
+
+    def search(self, query: str, limit: int = 50, offset: int = 0) -> list[NoteSearchResult]:
+        """Полнотекстовый поиск заметок с ранжированием и подсветкой"""
+        match = self._build_match_query(query)
+        if not match:
+            return []
+
+        if not self.fts_enabled:
+            return self._search_like(query, limit, offset)
+
+        cursor = self.db.execute(
+            """
+            SELECT n.id, n.title, n.content,
+                   highlight(notes_fts, 0, ?, ?),
+                   snippet(notes_fts, 1, ?, ?, '…', 16),
+                   notes_fts.rank
+            FROM notes_fts
+            JOIN notes AS n ON n.id = notes_fts.rowid
+            WHERE notes_fts MATCH ?
+            ORDER BY notes_fts.rank
+            LIMIT ? OFFSET ?
+            """,
+            (
+                self.HIGHLIGHT_START, self.HIGHLIGHT_END,
+                self.HIGHLIGHT_START, self.HIGHLIGHT_END,
+                match, limit, offset
+            )
+        )
+        return [
+            NoteSearchResult(
+                note=Note(id=row[0], title=row[1], content=row[2]),
+                title_snippet=row[3],
+                content_snippet=row[4],
+                rank=row[5]
+            ) for row in cursor.fetchall()
+        ]
+
+    def search_count(self, query: str) -> int:
+        """Количество заметок, найденных search()"""
+        match = self._build_match_query(query)
+        if not match:
+            return 0
+
+        if not self.fts_enabled:
+            pattern = self._like_pattern(query)
+            return self.db.execute(
+                r"""
+                SELECT COUNT(*) FROM notes
+                WHERE title LIKE ? ESCAPE '\' OR content LIKE ? ESCAPE '\'
+                """,
+                (pattern, pattern)
+            ).fetchone()[0]
+
+        return self.db.execute(
+            "SELECT COUNT(*) FROM notes_fts WHERE notes_fts MATCH ?",
+            (match,)
+        ).fetchone()[0]
+
+    def _search_like(self, query: str, limit: int, offset: int) -> list[NoteSearchResult]:
+        """Запасной поиск подстрокой, если FTS5 недоступен"""
+        pattern = self._like_pattern(query)
+        cursor = self.db.execute(
+            r"""
+            SELECT id, title, content FROM notes
+            WHERE title LIKE ? ESCAPE '\' OR content LIKE ? ESCAPE '\'
+            ORDER BY id
+            LIMIT ? OFFSET ?
+            """,
+            (pattern, pattern, limit, offset)
+        )
+        return [
+            NoteSearchResult(
+                note=Note(*row),
+                title_snippet=row[1],
+                content_snippet=row[2],
+                rank=0.0
+            ) for row in cursor.fetchall()
+        ]
+
+    @staticmethod
+    def _like_pattern(query: str) -> str:
+        """Шаблон LIKE для поиска подстроки (спецсимволы LIKE экранируются)"""
+        escaped = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
+    @classmethod
+    def _build_match_query(cls, query: str) -> str:
+        """Превращает ввод пользователя в безопасный запрос FTS5
+
+        Каждое слово ищется как префикс (короткие — целиком),
+        все слова должны встретиться.
+        """
+        terms = query.replace('"', " ").split()
+        return " ".join(
+            f'"{term}"*' if len(term) >= cls.MIN_PREFIX_LENGTH else f'"{term}"'
+            for term in terms
+        )
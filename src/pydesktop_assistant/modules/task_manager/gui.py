@@ -3,69 +3,52 @@ from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from datetime import datetime
 from .task_manager import TaskManager
+from ...gui.background import BackgroundExecutor
+from ...gui.virtual_list import VirtualList
+from ...gui.theme import apply_theme
 
 
 class TaskManagerGUI(tk.Toplevel):
     """Окно управления задачами"""
 
-    def __init__(self, master=None):
+    # Фильтры списка: подпись -> функция, возвращающая аргументы TaskManager.query
+    FILTERS = {
+        "Все задачи": lambda now: {},
+        "В работе": lambda now: {"completed": False, "due_after": now},
+        "Просроченные": lambda now: {"completed": False, "due_before": now},
+        "Выполненные": lambda now: {"completed": True},
+    }
+    # Сортировка списка: подпись -> ключ TaskManager.ORDER_BY
+    SORTS = {
+        "По ID": "id",
+        "По сроку": "due_date",
+        "По приоритету": "priority",
+        "По названию": "title",
+    }
+
+    def __init__(self, master=None, services=None):
         super().__init__(master)
         self.title("Менеджер задач")
         self.geometry("850x550")
         self.minsize(800, 500)
 
-        # Инициализируем менеджер задач
-        self.task_manager = TaskManager()
+        # Менеджер задач общий для всего приложения (см. ServiceRegistry);
+        # без реестра окно создаёт собственный
+        self.task_manager = services.tasks if services is not None else TaskManager()
+        # Запросы к БД выполняются в фоне, чтобы не блокировать интерфейс
+        self.io = BackgroundExecutor(self, services.io_pool if services is not None else None)
+        # Параметры выборки, по которым построена таблица (см. _refresh_tasks_list)
+        self._view = {"now": datetime.now(), "filters": {}, "order_by": "id"}
 
-        # Настраиваем стили
-        self._setup_style()
+        # Тема и стили применяются один раз на всё приложение
+        apply_theme(self)
 
         # Создаём и размещаем виджеты
         self._create_widgets()
 
         # Заполняем таблицу текущими задачами
         self._refresh_tasks_list()
-
-    def _setup_style(self):
-        """Настройка стиля для ttk-виджетов"""
-        style = ttk.Style(self)
-        try:
-            style.theme_use('clam')
-        except tk.TclError:
-            style.theme_use(style.theme_use())
-
-        # Стиль для заголовков LabelFrame
-        style.configure(
-            "TLabelframe.Label",
-            font=("Segoe UI", 12, "bold"),
-            foreground="#444444"
-        )
-
-        # Стиль для обычных меток
-        style.configure(
-            "TLabel",
-            font=("Segoe UI", 10),
-            foreground="#333333"
-        )
-
-        # Стиль для кнопок
-        style.configure(
-            "TButton",
-            font=("Segoe UI", 11),
-            padding=(8, 4)
-        )
-
-        # Стиль для Treeview
-        style.configure(
-            "Treeview.Heading",
-            font=("Segoe UI", 10, "bold"),
-            foreground="#222222"
-        )
-        style.configure(
-            "Treeview",
-            font=("Segoe UI", 10),
-            rowheight=24
-        )
+        self.bind("<Destroy>", self._on_destroy)
 
     def _create_widgets(self):
         """Создание и расположение всех виджетов окна"""
@@ -83,8 +66,7 @@ class TaskManagerGUI(tk.Toplevel):
         header = ttk.Label(
             container,
             text="Менеджер задач",
-            font=("Segoe UI", 16, "bold"),
-            foreground="#2E4053"
+            style="Header.TLabel"
         )
         header.grid(row=0, column=0, pady=(0, 15))
 
@@ -142,16 +124,46 @@ class TaskManagerGUI(tk.Toplevel):
         # ---- Нижняя часть: Список (таблица) задач ----
         tasks_frame = ttk.LabelFrame(container, text="Список задач")
         tasks_frame.grid(row=2, column=0, sticky="nsew", pady=(0, 10))
-        tasks_frame.rowconfigure(0, weight=1)
+        tasks_frame.rowconfigure(1, weight=1)
         tasks_frame.columnconfigure(0, weight=1)
 
+        # Фильтр и сортировка над таблицей
+        view_frame = ttk.Frame(tasks_frame)
+        view_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=(5, 0))
+
+        ttk.Label(view_frame, text="Показать:").pack(side="left")
+        self.filter_var = tk.StringVar(value=next(iter(self.FILTERS)))
+        filter_combobox = ttk.Combobox(
+            view_frame,
+            textvariable=self.filter_var,
+            values=list(self.FILTERS),
+            state="readonly",
+            width=14
+        )
+        filter_combobox.pack(side="left", padx=(5, 15))
+        filter_combobox.bind("<<ComboboxSelected>>", lambda e: self._refresh_tasks_list())
+
+        ttk.Label(view_frame, text="Сортировка:").pack(side="left")
+        self.sort_var = tk.StringVar(value=next(iter(self.SORTS)))
+        sort_combobox = ttk.Combobox(
+            view_frame,
+            textvariable=self.sort_var,
+            values=list(self.SORTS),
+            state="readonly",
+            width=14
+        )
+        sort_combobox.pack(side="left", padx=5)
+        sort_combobox.bind("<<ComboboxSelected>>", lambda e: self._refresh_tasks_list())
+
+        # Виртуальная таблица: строки подгружаются страницами при прокрутке
         columns = ("id", "title", "priority", "due_date", "status")
-        self.tasks_list = ttk.Treeview(
+        self.tasks_list = VirtualList(
             tasks_frame,
             columns=columns,
-            show="headings",
-            selectmode="browse",
-            height=12
+            count=self._count_tasks,
+            fetch=self._fetch_tasks,
+            height=12,
+            executor=self.io
         )
 
         # Заголовки и настройки колонок
@@ -167,14 +179,10 @@ class TaskManagerGUI(tk.Toplevel):
         self.tasks_list.column("due_date", width=180, anchor="center")
         self.tasks_list.column("status", width=120, anchor="center")
 
-        # Вертикальный скроллбар
-        scroll_y = ttk.Scrollbar(
-            tasks_frame, orient="vertical", command=self.tasks_list.yview
-        )
-        self.tasks_list.configure(yscrollcommand=scroll_y.set)
+        # Настройка тегов (например, красный фон для просроченных)
+        self.tasks_list.tag_configure("overdue", background="#F8D7DA")
 
-        self.tasks_list.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
-        scroll_y.grid(row=0, column=1, sticky="ns", padx=(0, 5), pady=5)
+        self.tasks_list.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
 
         # ---- Кнопки управления задачами ----
         button_frame = ttk.Frame(container)
@@ -219,70 +227,82 @@ class TaskManagerGUI(tk.Toplevel):
             messagebox.showerror("Ошибка", "Некорректный формат времени!\nИспользуйте ЧЧ:ММ")
             return
 
-        self.task_manager.create_task(title, priority_key, due_date)
+        self.io.submit(
+            self.task_manager.create_task, title, priority_key, due_date,
+            on_success=lambda task: self._refresh_tasks_list()
+        )
         self.title_entry.delete(0, tk.END)
-        self._refresh_tasks_list()
 
     def _delete_task(self):
         """Удаление выбранной задачи"""
-        selected = self.tasks_list.selection()
-        if not selected:
+        task_id = self.tasks_list.selected_key()
+        if task_id is None:
             messagebox.showerror("Ошибка", "Выберите задачу для удаления!")
             return
 
-        task_id = int(self.tasks_list.item(selected[0], "values")[0])
-        self.task_manager.delete_task(task_id)
-        self._refresh_tasks_list()
+        self.tasks_list.clear_selection()
+        self.io.submit(
+            self.task_manager.delete_task, task_id,
+            on_success=lambda _: self._refresh_tasks_list()
+        )
 
     def _toggle_status(self):
         """Переключение статуса задачи (выполнена/не выполнена)"""
-        selected = self.tasks_list.selection()
-        if not selected:
+        task_id = self.tasks_list.selected_key()
+        if task_id is None:
             messagebox.showerror("Ошибка", "Выберите задачу!")
             return
 
-        task_id = int(self.tasks_list.item(selected[0], "values")[0])
-        self.task_manager.toggle_task_status(task_id)
-        self._refresh_tasks_list()
+        self.io.submit(
+            self.task_manager.toggle_task_status, task_id,
+            on_success=lambda _: self._refresh_tasks_list()
+        )
 
     def _refresh_tasks_list(self):
         """Обновление списка задач в таблице"""
-        # Очищаем текущий список
-        for item in self.tasks_list.get_children():
-            self.tasks_list.delete(item)
-
-        # Получаем все задачи и сортируем их по ID
-        tasks = sorted(
-            self.task_manager.get_all_tasks(),
-            key=lambda x: x.id
+        # Фильтрация, сортировка и просроченность считаются в SQLite
+        # относительно одного момента времени
+        now = datetime.now()
+        self._view = {
+            "now": now,
+            "filters": self.FILTERS[self.filter_var.get()](now),
+            "order_by": self.SORTS[self.sort_var.get()],
+        }
+        self.tasks_list.refresh()
+
+    def _count_tasks(self) -> int:
+        """Количество задач в текущем представлении"""
+        return self.task_manager.count(**self._view["filters"])
+
+    def _fetch_tasks(self, offset: int, limit: int) -> list:
+        """Страница строк таблицы: (ключ, values, tags)"""
+        tasks = self.task_manager.query(
+            order_by=self._view["order_by"],
+            limit=limit,
+            offset=offset,
+            now=self._view["now"],
+            **self._view["filters"]
         )
 
+        rows = []
         for task in tasks:
             due_date_str = task.due_date.strftime("%d.%m.%Y %H:%M")
             if task.is_completed:
                 status = "✅ Выполнена"
-            elif task.due_date < datetime.now():
+            elif task.is_overdue:
                 status = "❌ Просрочено"
             else:
                 status = "⏳ В работе"
 
             priority = TaskManager.PRIORITIES[task.priority]
-
-            item = self.tasks_list.insert(
-                "",
-                tk.END,
-                values=(
-                    task.id,
-                    task.title,
-                    priority,
-                    due_date_str,
-                    status
-                )
-            )
+            values = (task.id, task.title, priority, due_date_str, status)
 
             # Если задача не выполнена и просрочена, подсвечиваем строку тегом
-            if not task.is_completed and task.due_date < datetime.now():
-                self.tasks_list.item(item, tags=("overdue",))
-
-        # Настройка тегов (например, красный фон для просроченных)
-        self.tasks_list.tag_configure("overdue", background="#F8D7DA")
+            tags = ("overdue",) if task.is_overdue else ()
+            rows.append((task.id, values, tags))
+        return rows
+
+    def _on_destroy(self, event):
+        """Окно закрыто — прекращаем фоновые запросы"""
+        if event.widget is self:
+            self.io.shutdown()
@@ -1,7 +1,9 @@
-import sqlite3
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Iterable, Iterator
+from ...storage.database import Database
+from ...storage.id_allocator import FreeIdAllocator
 
 
 @dataclass
@@ -11,6 +13,7 @@ class Task:
     priority: str
     due_date: datetime
     is_completed: bool = False
+    is_overdue: bool = False
 
 
 class TaskManager:
@@ -18,13 +21,23 @@ class TaskManager:
 
     PRIORITIES = {"high": "🔥 Высокий", "medium": "⚠️ Средний", "low": "✅ Низкий"}
 
+    # Допустимые ключи сортировки для query() и соответствующие SQL-выражения
+    ORDER_BY = {
+        "id": "id",
+        "title": "title",
+        "due_date": "due_date",
+        "priority": "CASE priority WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END",
+    }
+
     def __init__(self, db_path: str = "tasks.db"):
         self.db_path = Path(db_path)
+        self.db = Database.shared(self.db_path)
+        self._ids = FreeIdAllocator("tasks")
         self._init_db()
 
     def _init_db(self):
         """Инициализация базы данных"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS tasks (
                     id INTEGER PRIMARY KEY,
@@ -34,68 +47,174 @@ class TaskManager:
                     is_completed BOOLEAN DEFAULT FALSE
                 )
             """)
-
-    def _get_available_id(self) -> int:
-        """Находит минимальный доступный ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Получаем все существующие ID
-            cursor.execute("SELECT id FROM tasks ORDER BY id")
-            existing_ids = {row[0] for row in cursor.fetchall()}
-
-            # Ищем первую "дыру" в последовательности
-            expected_id = 1
-            while True:
-                if expected_id not in existing_ids:
-                    return expected_id
-                expected_id += 1
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_completed_due ON tasks (is_completed, due_date)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority)")
+            self._ids.install(conn)
 
     def toggle_task_status(self, task_id: int):
         """Изменяет статус выполнения задачи"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self.db.transaction() as conn:
+            conn.execute(
                 "UPDATE tasks SET is_completed = NOT is_completed WHERE id = ?",
                 (task_id,)
             )
 
     def create_task(self, title: str, priority: str, due_date: datetime) -> Task:
         """Создание задачи с минимальным доступным ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            task_id = self._get_available_id()
+        return self.create_tasks([(title, priority, due_date)])[0]
 
-            cursor.execute(
+    def create_tasks(self, tasks: Iterable[tuple[str, str, datetime]]) -> list[Task]:
+        """Пакетное создание задач (название, приоритет, срок) в одной транзакции"""
+        tasks = list(tasks)
+        if not tasks:
+            return []
+
+        with self.db.transaction() as conn:
+            # ID для всей пачки выдаём за один проход
+            task_ids = self._ids.allocate(conn, len(tasks))
+            conn.executemany(
                 """
-                INSERT INTO tasks (id, title, priority, due_date) 
+                INSERT INTO tasks (id, title, priority, due_date)
                 VALUES (?, ?, ?, ?)
                 """,
-                (task_id, title, priority, due_date.isoformat())
+                [
+                    (task_id, title, priority, due_date.isoformat())
+                    for task_id, (title, priority, due_date) in zip(task_ids, tasks)
+                ]
             )
-            return Task(
+        now = datetime.now()
+        return [
+            Task(
                 id=task_id,
                 title=title,
                 priority=priority,
-                due_date=due_date
-            )
+                due_date=due_date,
+                is_overdue=due_date < now
+            ) for task_id, (title, priority, due_date) in zip(task_ids, tasks)
+        ]
 
     def delete_task(self, task_id: int):
         """Удаление задачи по ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self.delete_many([task_id])
+
+    def delete_many(self, task_ids: Iterable[int]):
+        """Пакетное удаление задач в одной транзакции"""
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "DELETE FROM tasks WHERE id = ?",
+                [(task_id,) for task_id in task_ids]
+            )
 
     def get_all_tasks(self) -> list[Task]:
         """Получение всех задач"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, title, priority, due_date, is_completed FROM tasks")
-            return [
-                Task(
-                    id=row[0],
-                    title=row[1],
-                    priority=row[2],
-                    due_date=datetime.fromisoformat(row[3]),
-                    is_completed=bool(row[4])
-                ) for row in cursor.fetchall()
-            ]
+        return list(self.iter_tasks())
+
+    def iter_tasks(self, chunk_size: int = 500, now: datetime | None = None) -> Iterator[Task]:
+        """Потоковый обход задач по возрастанию ID порциями
+
+        Просроченность всех порций считается относительно одного момента `now`.
+        """
+        rows = self.db.iter_keyset(
+            """
+            SELECT id, title, priority, due_date, is_completed,
+                   NOT is_completed AND due_date < ? AS is_overdue
+            FROM tasks
+            WHERE id > ? ORDER BY id LIMIT ?
+            """,
+            ((now or datetime.now()).isoformat(),),
+            chunk_size=chunk_size
+        )
+        for row in rows:
+            yield self._row_to_task(row)
+
+    def query(
+        self,
+        priority: str | None = None,
+        completed: bool | None = None,
+        due_before: datetime | None = None,
+        due_after: datetime | None = None,
+        order_by: str = "id",
+        limit: int | None = None,
+        offset: int = 0,
+        now: datetime | None = None
+    ) -> list[Task]:
+        """Выборка задач с фильтрацией и сортировкой на стороне SQLite
+
+        Срок фильтруется как due_after <= due_date < due_before.
+        Сортировка — ключ из ORDER_BY, префикс "-" означает обратный порядок.
+        Просроченность считается в запросе относительно одного момента `now`.
+        """
+        descending = order_by.startswith("-")
+        order_key = order_by.lstrip("-")
+        if order_key not in self.ORDER_BY:
+            raise ValueError(f"Неподдерживаемая сортировка: {order_by}")
+
+        where, params = self._build_filter(priority, completed, due_before, due_after)
+        params["now"] = (now or datetime.now()).isoformat()
+        direction = "DESC" if descending else "ASC"
+        params["limit"] = -1 if limit is None else limit
+        params["offset"] = offset
+
+        cursor = self.db.execute(
+            f"""
+            SELECT id, title, priority, due_date, is_completed,
+                   NOT is_completed AND due_date < :now AS is_overdue
+            FROM tasks
+            {where}
+            ORDER BY {self.ORDER_BY[order_key]} {direction}, id {direction}
+            LIMIT :limit OFFSET :offset
+            """,
+            params
+        )
+        return [self._row_to_task(row) for row in cursor.fetchall()]
+
+    def count(
+        self,
+        priority: str | None = None,
+        completed: bool | None = None,
+        due_before: datetime | None = None,
+        due_after: datetime | None = None
+    ) -> int:
+        """Количество задач, подходящих под те же фильтры, что и в query()"""
+        where, params = self._build_filter(priority, completed, due_before, due_after)
+        return self.db.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+
+    @staticmethod
+    def _build_filter(
+        priority: str | None,
+        completed: bool | None,
+        due_before: datetime | None,
+        due_after: datetime | None
+    ) -> tuple[str, dict]:
+        """Условие WHERE и именованные параметры для фильтров задач"""
+        conditions = []
+        params = {}
+        if priority is not None:
+            conditions.append("priority = :priority")
+            params["priority"] = priority
+        if completed is not None:
+            conditions.append("is_completed = :completed")
+            params["completed"] = int(completed)
+        if due_before is not None:
+            conditions.append("due_date < :due_before")
+            params["due_before"] = due_before.isoformat()
+        if due_after is not None:
+            conditions.append("due_date >= :due_after")
+            params["due_after"] = due_after.isoformat()
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    @staticmethod
+    def _row_to_task(row: tuple) -> Task:
+        """Преобразование строки таблицы tasks в Task"""
+        return Task(
+            id=row[0],
+            title=row[1],
+            priority=row[2],
+            due_date=datetime.fromisoformat(row[3]),
+            is_completed=bool(row[4]),
+            is_overdue=bool(row[5])
+        )
@@ -1,69 +1,40 @@
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 from .timer import TimerManager
+from ...gui.theme import apply_theme
 
 
 class TimerGUI(tk.Toplevel):
     """Окно управления таймерами"""
 
-    def __init__(self, master=None):
+    def __init__(self, master=None, services=None):
         super().__init__(master)
         self.title("Таймер")
         self.geometry("650x450")
         self.minsize(600, 400)
 
-        # Инициализируем менеджер таймеров
-        self.timer_manager = TimerManager()
+        # Менеджер таймеров общий для всего приложения (см. ServiceRegistry):
+        # таймеры продолжают идти и после закрытия окна
+        self.timer_manager = services.timers if services is not None else TimerManager()
+        self._timer_rows = {}  # id таймера -> (элемент таблицы, показанное время)
+        self._tick_job = None
+        self._paused = False
 
-        # Настраиваем стили
-        self._setup_style()
+        # Тема и стили применяются один раз на всё приложение
+        apply_theme(self)
 
         # Создаём и размещаем виджеты
         self._create_widgets()
 
-        # Запускаем обновление списка таймеров
-        self._update_timers_list()
-
-    def _setup_style(self):
-        """Настройка стиля для ttk-виджетов"""
-        style = ttk.Style(self)
-        try:
-            style.theme_use('clam')
-        except tk.TclError:
-            style.theme_use(style.theme_use())
-
-        # Стиль для заголовков LabelFrame
-        style.configure(
-            "TLabelframe.Label",
-            font=("Segoe UI", 12, "bold"),
-            foreground="#444444"
-        )
-
-        # Стиль для обычных меток
-        style.configure(
-            "TLabel",
-            font=("Segoe UI", 10),
-            foreground="#333333"
-        )
-
-        # Стиль для кнопок
-        style.configure(
-            "TButton",
-            font=("Segoe UI", 11),
-            padding=(8, 4)
-        )
+        # Обновления приостанавливаются, пока окно свёрнуто или скрыто,
+        # и прекращаются при закрытии окна
+        self.bind("<Map>", self._on_map)
+        self.bind("<Unmap>", self._on_unmap)
+        self.bind("<Destroy>", self._on_destroy)
 
-        # Стиль для Treeview
-        style.configure(
-            "Treeview.Heading",
-            font=("Segoe UI", 10, "bold"),
-            foreground="#222222"
-        )
-        style.configure(
-            "Treeview",
-            font=("Segoe UI", 10),
-            rowheight=24
-        )
+        # Запускаем обновление списка таймеров
+        self._tick()
 
     def _create_widgets(self):
         """Создание и расположение всех виджетов окна"""
@@ -81,8 +52,7 @@ class TimerGUI(tk.Toplevel):
         header = ttk.Label(
             container,
             text="Таймер",
-            font=("Segoe UI", 16, "bold"),
-            foreground="#2E4053"
+            style="Header.TLabel"
         )
         header.grid(row=0, column=0, columnspan=2, pady=(0, 15))
 
@@ -238,23 +208,71 @@ class TimerGUI(tk.Toplevel):
 
     def _update_timers_list(self):
         """Обновление списка активных таймеров"""
-        # Очищаем текущий список
-        for item in self.timers_list.get_children():
-            self.timers_list.delete(item)
-
-        # Заполняем новыми данными
+        active_ids = set()
         for timer in self.timer_manager.get_active_timers():
+            timer_id = timer["id"]
+            active_ids.add(timer_id)
+
             remaining = timer["remaining"]
             hours = remaining // 3600
             minutes = (remaining % 3600) // 60
             seconds = remaining % 60
             time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
-            self.timers_list.insert(
-                "",
-                tk.END,
-                values=(timer["id"], time_str, timer["message"])
-            )
+            row = self._timer_rows.get(timer_id)
+            if row is None:
+                item = self.timers_list.insert(
+                    "",
+                    tk.END,
+                    values=(timer_id, time_str, timer["message"])
+                )
+                self._timer_rows[timer_id] = (item, time_str)
+            elif row[1] != time_str:
+                # Меняем только ячейку с оставшимся временем
+                self.timers_list.set(row[0], "time_left", time_str)
+                self._timer_rows[timer_id] = (row[0], time_str)
+
+        # Удаляем завершённые и отменённые таймеры
+        finished = [timer_id for timer_id in self._timer_rows if timer_id not in active_ids]
+        if finished:
+            self.timers_list.delete(*(self._timer_rows.pop(timer_id)[0] for timer_id in finished))
+
+    def _tick(self):
+        """Ежесекундное обновление списка"""
+        self._tick_job = None
+        self._update_timers_list()
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        """Планирует следующее обновление на ближайшую границу секунды
 
-        # Повторяем обновление каждую секунду
-        self.after(1000, self._update_timers_list)
+        Задержка считается по монотонным часам от текущего момента,
+        поэтому время самого обновления не накапливается в дрейф.
+        """
+        if self._tick_job is not None or self._paused:
+            return
+        delay_ms = int((1.0 - time.monotonic() % 1.0) * 1000) + 1
+        self._tick_job = self.after(delay_ms, self._tick)
+
+    def _cancel_tick(self):
+        """Отменяет запланированное обновление"""
+        if self._tick_job is not None:
+            self.after_cancel(self._tick_job)
+            self._tick_job = None
+
+    def _on_map(self, event):
+        """Окно снова показано — возобновляем обновления"""
+        if event.widget is self and self._paused:
+            self._paused = False
+            self._tick()
+
+    def _on_unmap(self, event):
+        """Окно свёрнуто или скрыто — приостанавливаем обновления"""
+        if event.widget is self:
+            self._paused = True
+            self._cancel_tick()
+
+    def _on_destroy(self, event):
+        """Окно закрыто — останавливаем обновления"""
+        if event.widget is self:
+            self._cancel_tick()
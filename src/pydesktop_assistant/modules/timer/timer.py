@@ -1,37 +1,112 @@
+import heapq
 import threading
 import time
-from plyer import notification
+from ...notifications import NotificationDispatcher
 
 
 class TimerManager:
-    """Менеджер таймеров с уведомлениями"""
+    """Менеджер таймеров с уведомлениями
 
-    def __init__(self):
-        self.timers = {}  # Словарь активных таймеров: id -> threading.Timer
+    Все таймеры обслуживает один поток-планировщик с кучей моментов
+    срабатывания по монотонным часам. Отменённые таймеры из кучи
+    не удаляются, а пропускаются при извлечении (ленивое удаление).
+    Уведомления только ставятся в очередь NotificationDispatcher,
+    поэтому обработчики завершения выполняются прямо в планировщике.
+    """
+
+    # Минимальный размер кучи, с которого имеет смысл её чистить
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self, notifier: NotificationDispatcher | None = None):
+        self.notifier = notifier or NotificationDispatcher.shared()
+        self.timers = {}  # Словарь активных таймеров: id -> данные таймера
         self.next_id = 1  # Счетчик для ID таймеров
+        self.running = True
+
+        self._heap = []  # Куча (момент срабатывания по time.monotonic, id)
+        self._cancelled = 0  # Сколько записей в куче относятся к отменённым таймерам
+        self._wakeup = threading.Condition()
+        self._thread = None
 
     def start_timer(self, seconds: int, message: str) -> int:
         """Запускает новый таймер, возвращает ID таймера"""
-        timer_id = self.next_id
-        self.next_id += 1
+        with self._wakeup:
+            timer_id = self.next_id
+            self.next_id += 1
 
-        # Создаем и запускаем таймер
-        timer = threading.Timer(seconds, self._timer_completed, args=[timer_id, message])
-        timer.start()
+            deadline = time.monotonic() + seconds
+            self.timers[timer_id] = {
+                "message": message,
+                "end_time": time.time() + seconds,
+                "deadline": deadline
+            }
+            heapq.heappush(self._heap, (deadline, timer_id))
 
-        self.timers[timer_id] = {
-            "timer": timer,
-            "message": message,
-            "end_time": time.time() + seconds
-        }
+            self._ensure_scheduler()
+            # Будим планировщик, только если этот таймер стал ближайшим
+            if self._heap[0][1] == timer_id:
+                self._wakeup.notify()
 
         return timer_id
 
     def cancel_timer(self, timer_id: int):
         """Отменяет таймер по ID"""
-        if timer_id in self.timers:
-            self.timers[timer_id]["timer"].cancel()
-            del self.timers[timer_id]
+        with self._wakeup:
+            if self.timers.pop(timer_id, None) is None:
+                return
+            self._cancelled += 1
+
+            # Если отменённых записей больше половины, пересобираем кучу
+            if len(self._heap) > self.COMPACT_THRESHOLD and self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if entry[1] in self.timers]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def shutdown(self):
+        """Останавливает планировщик"""
+        with self._wakeup:
+            self.running = False
+            self._wakeup.notify()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    def _ensure_scheduler(self):
+        """Лениво запускает поток-планировщик (под self._wakeup)"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run_scheduler,
+                name="timer-scheduler",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run_scheduler(self):
+        """Цикл планировщика: спит до ближайшего таймера"""
+        while True:
+            with self._wakeup:
+                due = self._pop_due_timers()
+                while not due and self.running:
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._wakeup.wait(timeout)
+                    due = self._pop_due_timers()
+                if not self.running:
+                    return
+
+            for timer_id, message in due:
+                self._timer_completed(timer_id, message)
+
+    def _pop_due_timers(self) -> list[tuple[int, str]]:
+        """Извлекает сработавшие таймеры из кучи (под self._wakeup)"""
+        due = []
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, timer_id = heapq.heappop(self._heap)
+            data = self.timers.get(timer_id)
+            if data is None:
+                self._cancelled = max(0, self._cancelled - 1)
+                continue
+            due.append((timer_id, data["message"]))
+        return due
 
     def _timer_completed(self, timer_id: int, message: str):
         """Обработчик завершения таймера"""
@@ -39,29 +114,22 @@ class TimerManager:
         self._show_notification("Таймер завершен!", message)
 
         # Удалить таймер из словаря
-        if timer_id in self.timers:
-            del self.timers[timer_id]
+        with self._wakeup:
+            self.timers.pop(timer_id, None)
 
     def _show_notification(self, title: str, message: str):
-        """Показывает системное уведомление"""
-        try:
-            notification.notify(
-                title=title,
-                message=message,
-                app_name="PyDesktop Assistant",
-                timeout=10  # Уведомление видно 10 секунд
-            )
-        except:
-            # Fallback для систем без поддержки уведомлений
-            print(f"Уведомление: {title} - {message}")
+        """Ставит системное уведомление в очередь"""
+        self.notifier.notify(title, message)
 
     def get_active_timers(self) -> list:
         """Возвращает список активных таймеров"""
-        return [
-            {
-                "id": tid,
-                "message": data["message"],
-                "remaining": max(0, int(data["end_time"] - time.time()))
-            }
-            for tid, data in self.timers.items()
-        ]
+        now = time.monotonic()
+        with self._wakeup:
+            return [
+                {
+                    "id": tid,
+                    "message": data["message"],
+                    "remaining": max(0, int(data["deadline"] - now))
+                }
+                for tid, data in self.timers.items()
+            ]
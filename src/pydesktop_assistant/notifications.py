@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+
+class NotificationDispatcher:
+    """Единая очередь системных уведомлений
+
+    notify() только ставит уведомление в очередь и сразу возвращается.
+    Показывает уведомления один рабочий поток: пачку уведомлений,
+    накопившуюся за окно склейки или пока действует ограничение
+    частоты, он объединяет в одно сводное. Частоту показа ограничивает
+    «ведро токенов»: не больше burst уведомлений подряд, дальше —
+    rate уведомлений в секунду.
+    """
+
+    APP_NAME = "PyDesktop Assistant"
+    # Сколько уведомлений перечислять в сводном
+    SUMMARY_LIMIT = 3
+    # По скольким последним уведомлениям считать статистику задержки
+    LATENCY_WINDOW = 1000
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 3,
+        coalesce_window: float = 0.05,
+        deliver: Callable[[str, str], None] | None = None
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.coalesce_window = coalesce_window
+        self._deliver = deliver or self._show
+
+        self._queue = deque()  # (момент постановки по time.monotonic, заголовок, текст)
+        self._cond = threading.Condition()
+        self._busy = False  # рабочий поток показывает уведомление
+        self._running = True
+        self._thread = None
+
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._delivered = 0  # уведомлений доставлено (в том числе внутри сводных)
+        self._shown = 0  # показано всплывающих окон
+        self._coalesced = 0  # уведомлений, попавших в сводные
+
+    @classmethod
+    def shared(cls) -> "NotificationDispatcher":
+        """Общий для процесса диспетчер"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def notify(self, title: str, message: str):
+        """Ставит уведомление в очередь"""
+        with self._cond:
+            self._queue.append((time.monotonic(), title, message))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="notifications",
+                    daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Ждёт, пока очередь опустеет; False, если не дождались"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def shutdown(self, timeout: float = 1.0):
+        """Показывает оставшиеся уведомления без ограничения частоты и останавливает поток"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        """Статистика доставки и задержки (от notify() до показа), мс"""
+        with self._cond:
+            latencies = sorted(self._latencies)
+            stats = {
+                "delivered": self._delivered,
+                "shown": self._shown,
+                "coalesced": self._coalesced,
+                "queued": len(self._queue),
+            }
+        if latencies:
+            stats.update(
+                latency_p50_ms=latencies[len(latencies) // 2] * 1000,
+                latency_p95_ms=latencies[int(len(latencies) * 0.95)] * 1000,
+                latency_max_ms=latencies[-1] * 1000,
+            )
+        return stats
+
+    def _run(self):
+        """Цикл рабочего потока"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self._running)
+                if not self._queue:
+                    return
+                # Даём пачке одновременных уведомлений собраться целиком
+                self._cond.wait_for(lambda: not self._running, self.coalesce_window)
+                # Пока токенов нет, уведомления копятся и попадут в сводное
+                while self._running and (delay := self._token_delay()) > 0:
+                    self._cond.wait_for(lambda: not self._running, delay)
+                batch = list(self._queue)
+                self._queue.clear()
+                self._busy = True
+
+            try:
+                self._deliver_batch(batch)
+            except Exception as e:
+                print(f"Ошибка отправки уведомления: {e}")
+            finally:
+                now = time.monotonic()
+                with self._cond:
+                    self._latencies.extend(now - queued_at for queued_at, _, _ in batch)
+                    self._delivered += len(batch)
+                    self._shown += 1
+                    if len(batch) > 1:
+                        self._coalesced += len(batch)
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _token_delay(self) -> float:
+        """Забирает токен; если его нет — сколько ждать до следующего (под self._cond)"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _deliver_batch(self, batch: list[tuple[float, str, str]]):
+        """Показывает одно уведомление или сводное по пачке"""
+        if len(batch) == 1:
+            _, title, message = batch[0]
+            self._deliver(title, message)
+            return
+
+        lines = [f"{title}: {message}" for _, title, message in batch[:self.SUMMARY_LIMIT]]
+        if len(batch) > self.SUMMARY_LIMIT:
+            lines.append(f"…и ещё {len(batch) - self.SUMMARY_LIMIT}")
+        self._deliver(f"Новых уведомлений: {len(batch)}", "\n".join(lines))
+
+    def _show(self, title: str, message: str):
+        """Показывает системное уведомление"""
+        try:
+            # plyer загружается при первом уведомлении, а не при запуске приложения
+            from plyer import notification
+
+            notification.notify(
+                title=title,
+                message=message,
+                app_name=self.APP_NAME,
+                timeout=10  # Уведомление видно 10 секунд
+            )
+        except Exception:
+            # Fallback для систем без поддержки уведомлений
+            print(f"Уведомление: {title} - {message}")
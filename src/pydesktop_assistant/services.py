@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from .modules.calendar.calendar import CalendarManager
+    from .modules.notes.notes import NoteManager
+    from .modules.task_manager.task_manager import TaskManager
+    from .modules.timer.timer import TimerManager
+    from .notifications import NotificationDispatcher
+
+
+class ServiceRegistry:
+    """Общие для всего приложения менеджеры
+
+    Каждый менеджер создаётся один раз при первом обращении и
+    используется всеми окнами: один поток уведомлений календаря,
+    один планировщик таймеров, общие кеши и соединения с БД.
+    Модули менеджеров тоже импортируются только при первом обращении.
+    """
+
+    def __init__(self, data_dir: str | Path = "."):
+        self.data_dir = Path(data_dir)
+        self._services = {}  # имя -> созданный сервис
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _get(self, name: str, factory: Callable):
+        """Возвращает сервис, создавая его при первом обращении"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Сервисы приложения уже остановлены")
+            service = self._services.get(name)
+            if service is None:
+                service = self._services[name] = factory()
+            return service
+
+    @property
+    def notes(self) -> "NoteManager":
+        from .modules.notes.notes import NoteManager
+        return self._get("notes", lambda: NoteManager(self.data_dir / "notes.db"))
+
+    @property
+    def tasks(self) -> "TaskManager":
+        from .modules.task_manager.task_manager import TaskManager
+        return self._get("tasks", lambda: TaskManager(self.data_dir / "tasks.db"))
+
+    @property
+    def calendar(self) -> "CalendarManager":
+        from .modules.calendar.calendar import CalendarManager
+        # Диспетчер берём до _get: фабрика вызывается под блокировкой
+        notifier = self.notifications
+        return self._get(
+            "calendar",
+            lambda: CalendarManager(self.data_dir / "calendar.db", notifier=notifier)
+        )
+
+    @property
+    def timers(self) -> "TimerManager":
+        from .modules.timer.timer import TimerManager
+        notifier = self.notifications
+        return self._get("timers", lambda: TimerManager(notifier=notifier))
+
+    @property
+    def notifications(self) -> "NotificationDispatcher":
+        """Общая очередь системных уведомлений таймеров и календаря"""
+        from .notifications import NotificationDispatcher
+        return self._get("notifications", NotificationDispatcher)
+
+    @property
+    def io_pool(self) -> ThreadPoolExecutor:
+        """Общий рабочий поток для запросов к БД из всех окон"""
+        return self._get(
+            "io_pool",
+            lambda: ThreadPoolExecutor(max_workers=1, thread_name_prefix="gui-io")
+        )
+
+    def shutdown(self):
+        """Останавливает фоновые потоки и закрывает базы данных"""
+        with self._lock:
+            self._closed = True
+            services, self._services = self._services, {}
+
+        # Сначала дожидаемся уже отправленных записей в БД
+        if "io_pool" in services:
+            services["io_pool"].shutdown(wait=True)
+        if "calendar" in services:
+            services["calendar"].stop_notifications()
+        if "timers" in services:
+            services["timers"].shutdown()
+        # Уведомления останавливаем после их источников
+        if "notifications" in services:
+            services["notifications"].shutdown()
+        for name in ("notes", "tasks", "calendar"):
+            if name in services:
+                services[name].db.close()
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class _Connection(sqlite3.Connection):
+    """Соединение SQLite с поддержкой слабых ссылок"""
+
+
+class Database:
+    """Общий слой доступа к SQLite: одно долгоживущее соединение на поток"""
+
+    # Размер кеша подготовленных выражений на одно соединение
+    CACHED_STATEMENTS = 256
+
+    _shared = {}  # Общие экземпляры: путь к БД -> Database
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()  # все открытые соединения
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, db_path: str | Path) -> "Database":
+        """Возвращает общий для процесса экземпляр для файла БД"""
+        key = Path(db_path).resolve()
+        with cls._shared_lock:
+            db = cls._shared.get(key)
+            if db is None:
+                db = cls._shared[key] = cls(key)
+            return db
+
+    def connection(self) -> sqlite3.Connection:
+        """Соединение текущего потока (создаётся при первом обращении)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает и настраивает новое соединение"""
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,  # транзакциями управляем сами
+            check_same_thread=False,  # нужно только для close() из другого потока
+            cached_statements=self.CACHED_STATEMENTS,
+            factory=_Connection
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Транзакция на соединении текущего потока
+
+        Вложенный вызов переиспользует уже открытую транзакцию,
+        фиксирует её только самый внешний блок.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        """Выполняет запрос вне явной транзакции (для чтения)"""
+        return self.connection().execute(sql, params)
+
+    def iter_keyset(self, sql: str, params=(), chunk_size: int = 500) -> Iterator[tuple]:
+        """Потоковое чтение порциями с пагинацией по ключу
+
+        Запрос должен заканчиваться на `... id > ? ORDER BY id LIMIT ?`,
+        а первым столбцом выбирать ключ. Каждая порция — отдельный
+        короткий запрос, курсор между порциями не удерживается.
+        """
+        last_key = 0
+        while True:
+            rows = self.execute(sql, (*params, last_key, chunk_size)).fetchall()
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            last_key = rows[-1][0]
+
+    def close(self):
+        """Закрывает все соединения всех потоков"""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections = weakref.WeakSet()
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
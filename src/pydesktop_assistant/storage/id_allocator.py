@@ -0,0 +1,74 @@
+import sqlite3
+
+
+class FreeIdAllocator:
+    """Выдача минимального свободного ID таблицы за O(log n)
+
+    Освободившиеся ID хранятся в таблице `<table>_free_ids`, которую
+    поддерживают триггеры на удаление и вставку. Вместе с занятыми ID
+    она всегда покрывает отрезок 1..max без пропусков, поэтому
+    минимальный свободный ID — это либо наименьшая запись в ней,
+    либо max + 1.
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self.free_table = f"{table}_free_ids"
+
+    def install(self, conn: sqlite3.Connection):
+        """Создаёт таблицу свободных ID и триггеры, заполняет пропуски"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self.free_table,)
+        ).fetchone()
+        if exists:
+            return
+
+        conn.execute(f"CREATE TABLE {self.free_table} (id INTEGER PRIMARY KEY)")
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.table}_release_id
+            AFTER DELETE ON {self.table}
+            BEGIN
+                INSERT OR IGNORE INTO {self.free_table} (id) VALUES (old.id);
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.table}_take_id
+            AFTER INSERT ON {self.table}
+            BEGIN
+                DELETE FROM {self.free_table} WHERE id = new.id;
+            END
+        """)
+
+        # Переносим "дыры" уже существующих данных
+        gaps = conn.execute(f"""
+            SELECT prev_id + 1, id - 1 FROM (
+                SELECT id, LAG(id, 1, 0) OVER (ORDER BY id) AS prev_id
+                FROM {self.table}
+            )
+            WHERE id > prev_id + 1
+        """).fetchall()
+        conn.executemany(
+            f"INSERT INTO {self.free_table} (id) VALUES (?)",
+            ((free_id,) for first, last in gaps for free_id in range(first, last + 1))
+        )
+
+    def allocate(self, conn: sqlite3.Connection, count: int = 1) -> list[int]:
+        """Возвращает `count` минимальных свободных ID по возрастанию
+
+        Вызывать внутри транзакции, в которой эти ID будут заняты.
+        """
+        ids = [
+            row[0] for row in conn.execute(
+                f"SELECT id FROM {self.free_table} ORDER BY id LIMIT ?",
+                (count,)
+            )
+        ]
+        if len(ids) < count:
+            # Свободные ID закончились — продолжаем после максимального
+            max_id = conn.execute(
+                f"SELECT COALESCE(MAX(id), 0) FROM {self.table}"
+            ).fetchone()[0]
+            next_id = max(max_id, ids[-1] if ids else 0) + 1
+            ids.extend(range(next_id, next_id + count - len(ids)))
+        return ids
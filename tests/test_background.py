@@ -0,0 +1,107 @@
+import threading
+import time
+from src.pydesktop_assistant.gui.background import BackgroundExecutor
+
+
+class FakeWidget:
+    """Замена виджета Tk: after() лишь запоминает отложенные вызовы"""
+
+    def __init__(self):
+        self.jobs = {}
+        self._next = 0
+
+    def after(self, ms, func):
+        self._next += 1
+        job = f"after#{self._next}"
+        self.jobs[job] = func
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_pending(self, timeout=2.0):
+        """Крутит «главный цикл», пока есть отложенные вызовы"""
+        deadline = time.monotonic() + timeout
+        while self.jobs and time.monotonic() < deadline:
+            job, func = self.jobs.popitem()
+            func()
+            time.sleep(0.001)
+
+
+def test_callbacks_run_in_main_thread():
+    """Тест: задача идёт в рабочем потоке, обработчик — в главном"""
+    widget = FakeWidget()
+    io = BackgroundExecutor(widget)
+    threads = {}
+
+    def work(x):
+        threads["work"] = threading.current_thread()
+        return x * 2
+
+    results = []
+    def on_success(value):
+        threads["callback"] = threading.current_thread()
+        results.append(value)
+
+    io.submit(work, 21, on_success=on_success)
+    widget.run_pending()
+    io.shutdown()
+
+    assert results == [42]
+    assert threads["work"] is not threading.main_thread()
+    assert threads["callback"] is threading.main_thread()
+    # Когда задач нет, опрос очереди не продолжается
+    assert widget.jobs == {}
+
+
+def test_error_callback_and_order():
+    """Тест: ошибки передаются в on_error, задачи выполняются по порядку"""
+    widget = FakeWidget()
+    io = BackgroundExecutor(widget)
+    events = []
+
+    def fail():
+        raise ValueError("boom")
+
+    io.submit(str, "first", on_success=events.append)
+    io.submit(fail, on_error=lambda error: events.append(str(error)))
+    io.submit(str, "last", on_success=events.append)
+    widget.run_pending()
+    io.shutdown()
+
+    assert events == ["first", "boom", "last"]
+
+
+def test_shutdown_stops_polling():
+    """Тест: после shutdown() обработчики не вызываются"""
+    widget = FakeWidget()
+    io = BackgroundExecutor(widget)
+    results = []
+
+    io.submit(lambda: 1, on_success=results.append)
+    io.shutdown()
+    widget.run_pending(timeout=0.1)
+
+    assert results == []
+    assert widget.jobs == {}
+
+
+def test_failing_callback_does_not_stop_polling():
+    """Тест: исключение в обработчике не мешает применить остальные результаты"""
+    widget = FakeWidget()
+    io = BackgroundExecutor(widget)
+    reported = []
+    io.report_error = reported.append
+    results = []
+
+    def broken(value):
+        raise RuntimeError("broken callback")
+
+    io.submit(str, "first", on_success=broken)
+    io.submit(str, "second", on_success=results.append)
+    widget.run_pending()
+    io.shutdown()
+
+    assert results == ["second"]
+    assert [str(error) for error in reported] == ["broken callback"]
+    assert widget.jobs == {}
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+from pathlib import Path
+from src.pydesktop_assistant.calc.cli import chunked, evaluate_stream, main
+
+LINES = ["2 + 3\n", "\n", "1 / 0\n", "(1 + 2) * 3\n", "2 +\n"]
+EXPECTED = ["5.0", "", "Ошибка: Деление на ноль", "9.0", "Ошибка: Неожиданный конец выражения"]
+
+
+def test_chunked_is_lazy():
+    """Тест: порции берутся из потока по мере надобности"""
+    consumed = []
+
+    def lines():
+        for i in range(10):
+            consumed.append(i)
+            yield str(i)
+
+    chunks = chunked(lines(), 3)
+    assert next(chunks) == ["0", "1", "2"]
+    assert consumed == [0, 1, 2]
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+
+
+def test_evaluate_stream_in_process():
+    """Тест вычисления в текущем процессе с ошибками по строкам"""
+    assert list(evaluate_stream(LINES, workers=0, chunk_size=2)) == EXPECTED
+
+
+def test_evaluate_stream_process_pool():
+    """Тест: пул процессов сохраняет порядок строк"""
+    lines = [f"{i} * 2\n" for i in range(500)]
+
+    results = list(evaluate_stream(lines, workers=2, chunk_size=7))
+
+    assert results == [repr(i * 2.0) for i in range(500)]
+
+
+def test_main_with_files(tmp_path):
+    """Тест запуска с входным и выходным файлами"""
+    source = tmp_path / "input.txt"
+    target = tmp_path / "output.txt"
+    source.write_text("".join(LINES), encoding="utf-8")
+
+    main([str(source), "-o", str(target), "--workers", "0"])
+
+    assert target.read_text(encoding="utf-8").splitlines() == EXPECTED
+
+
+def test_module_entry_point():
+    """Тест запуска через python -m с чтением из stdin"""
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.pydesktop_assistant.calc", "--workers", "1"],
+        input="".join(LINES),
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        cwd=Path(__file__).resolve().parent.parent,
+        check=True
+    )
+
+    assert proc.stdout.splitlines() == EXPECTED
@@ -1,4 +1,8 @@
 from src.pydesktop_assistant.modules.calculator.calculator import Calculator
+from src.pydesktop_assistant.modules.calculator.limits import CostLimits
+from src.pydesktop_assistant.modules.calculator.parser import IncrementalTokenizer, tokenize
+from unittest.mock import patch
+import pytest
 import math
 
 
@@ -68,3 +72,292 @@ def test_floating_point_numbers():
     assert result == 5.0
     result = calc.calculate("10 / 3")
     assert abs(result - 3.3333333333333335) < 1e-10
+
+
+def test_operator_precedence():
+    calc = Calculator()
+    assert calc.calculate("2 + 3 * 4") == 14.0
+    assert calc.calculate("10 - 4 - 3") == 3.0
+    assert calc.calculate("2 * 3 ^ 2") == 18.0
+    assert calc.error_message is None
+
+
+def test_parentheses():
+    calc = Calculator()
+    assert calc.calculate("(1 + 2) * 3") == 9.0
+    assert calc.calculate("((2))") == 2.0
+    assert calc.calculate("-(2 + 3)") == -5.0
+
+
+def test_unary_minus():
+    calc = Calculator()
+    assert calc.calculate("-5 + 3") == -2.0
+    assert calc.calculate("--2") == 2.0
+    assert calc.calculate("-2 ^ 2") == -4.0
+    assert calc.calculate("2 ^ -1") == 0.5
+
+
+def test_power_is_right_associative():
+    calc = Calculator()
+    assert calc.calculate("2 ^ 3 ^ 2") == 512.0
+    assert calc.calculate("2 ** 3 ** 2") == 512.0
+
+
+def test_functions_and_constants():
+    calc = Calculator()
+    assert calc.calculate("sqrt(16) + abs(-2)") == 6.0
+    assert calc.calculate("log(1000)") == 3.0
+    assert abs(calc.calculate("sin(pi / 2)") - 1.0) < 1e-12
+    assert abs(calc.calculate("ln(e ^ 2)") - 2.0) < 1e-12
+    assert calc.error_message is None
+
+
+def test_function_errors():
+    calc = Calculator()
+    assert math.isnan(calc.calculate("sqrt(-1)"))
+    assert calc.error_message == "Недопустимый аргумент функции sqrt"
+
+    assert math.isnan(calc.calculate("foo(1)"))
+    assert calc.error_message == "Неизвестная функция: foo"
+
+    assert math.isnan(calc.calculate("x + 1"))
+    assert calc.error_message == "Неизвестная переменная: x"
+
+
+def test_division_by_zero_inside_expression():
+    calc = Calculator()
+    assert math.isnan(calc.calculate("1 + 2 / (3 - 3)"))
+    assert calc.error_message == "Деление на ноль"
+
+
+def test_syntax_errors():
+    calc = Calculator()
+    for expression, message in [
+        ("", "Не удалось распознать выражение"),
+        ("2 +", "Неожиданный конец выражения"),
+        ("(1 + 2", "Ожидалась ')' в конце выражения"),
+        ("2 $ 3", "Неожиданный символ '$' в позиции 3"),
+        ("2 3", "Неожиданный символ '3' в позиции 3"),
+    ]:
+        assert math.isnan(calc.calculate(expression))
+        assert calc.error_message == message
+
+    # После ошибки следующее вычисление сбрасывает сообщение
+    assert calc.calculate("1 + 1") == 2.0
+    assert calc.error_message is None
+
+
+def test_expression_cache():
+    calc = Calculator()
+    calc.calculate("2 + 3 * 4")
+    calc.calculate(" 2  +  3 * 4 ")
+    assert (calc.cache_hits, calc.cache_misses) == (1, 1)
+
+    # Повторное вычисление не разбирает строку заново
+    with patch("src.pydesktop_assistant.modules.calculator.calculator.parse") as parse:
+        assert calc.calculate("2 + 3 * 4") == 14.0
+    parse.assert_not_called()
+
+    # Ошибочные выражения в кеш не попадают
+    calc.calculate("2 +")
+    calc.calculate("2 +")
+    assert calc.cache_misses == 3
+
+
+def test_expression_cache_is_bounded():
+    calc = Calculator()
+    calc.EXPRESSION_CACHE_SIZE = 2
+    for expression in ("1 + 1", "2 + 2", "3 + 3", "1 + 1"):
+        calc.calculate(expression)
+
+    assert calc.cache_hits == 0
+    assert len(calc._expression_cache) == 2
+
+    calc.clear_cache()
+    assert (calc.cache_hits, calc.cache_misses) == (0, 0)
+
+
+def test_evaluate_many():
+    np = pytest.importorskip("numpy")
+    calc = Calculator()
+    x = np.arange(5.0)
+
+    result = calc.evaluate_many("x ^ 2 + 2 * x + 1", {"x": x})
+
+    assert calc.error_message is None
+    assert result.tolist() == [1.0, 4.0, 9.0, 16.0, 25.0]
+    # Результат совпадает с поэлементным calculate()
+    assert result[3] == calc.calculate("3 ^ 2 + 2 * 3 + 1")
+
+
+def test_evaluate_many_broadcasts_constants():
+    np = pytest.importorskip("numpy")
+    calc = Calculator()
+
+    assert calc.evaluate_many("pi", {"x": np.zeros(3)}).shape == (3,)
+    assert calc.evaluate_many("x * y", {"x": [1, 2], "y": 10}).tolist() == [10.0, 20.0]
+
+
+def test_evaluate_many_errors():
+    np = pytest.importorskip("numpy")
+    calc = Calculator()
+    x = np.array([1.0, 0.0, 2.0])
+
+    # NaN только там, где ошибка, остальные элементы вычислены
+    result = calc.evaluate_many("1 / x", {"x": x})
+    assert calc.error_message == "Деление на ноль"
+    assert result.shape == (3,)
+    assert result[0] == 1.0 and np.isnan(result[1]) and result[2] == 0.5
+
+    result = calc.evaluate_many("sqrt(x - 1)", {"x": x})
+    assert calc.error_message == "Недопустимый аргумент функции sqrt"
+    assert result[0] == 0.0 and np.isnan(result[1]) and result[2] == 1.0
+
+    # Ошибка всего выражения — массив целиком из NaN
+    result = calc.evaluate_many("x + y", {"x": x})
+    assert calc.error_message == "Неизвестная переменная: y"
+    assert np.isnan(result).all() and result.shape == (3,)
+
+
+def test_evaluate_many_errors_match_calculate():
+    np = pytest.importorskip("numpy")
+    calc = Calculator()
+    cases = [
+        ("exp(x)", [1.0, 800.0], "exp(800)"),
+        ("(x - 1) ^ -1", [2.0, 1.0], "(1 - 1) ^ -1"),
+        ("x ^ (1 / 3)", [8.0, -8.0], "(-8) ^ (1 / 3)"),
+        ("x ^ x", [2.0, 400.0], "400 ^ 400"),
+        ("fact(x)", [3.0, -1.0], "fact(-1)"),
+        ("log(x)", [10.0, 0.0], "log(0)"),
+    ]
+    for expression, values, scalar in cases:
+        result = calc.evaluate_many(expression, {"x": values})
+        vector_error = calc.error_message
+        calc.calculate(scalar)
+
+        assert vector_error == calc.error_message is not None, expression
+        assert np.isfinite(result[0]) and np.isnan(result[1]), expression
+
+    assert calc.evaluate_many("x ^ 2", {"x": [-2.0]}).tolist() == [4.0]
+    assert calc.error_message is None
+
+
+def test_evaluate_many_invalid_input():
+    np = pytest.importorskip("numpy")
+    calc = Calculator()
+
+    assert np.isnan(calc.evaluate_many("x", {"x": ["a"]})).all()
+    assert calc.error_message == "Недопустимые значения переменной x"
+
+    result = calc.evaluate_many("x + y", {"x": [1, 2], "y": [1, 2, 3]})
+    assert calc.error_message == "Размеры массивов переменных не совпадают"
+    assert np.isnan(result).all()
+
+
+def test_compile_with_variables():
+    calc = Calculator()
+    expr = calc.compile("x ^ 2 + 2 * x * y - 1")
+
+    assert expr.variables == {"x", "y"}
+    assert expr(x=3, y=1) == 14.0
+    assert expr(x=0, y=5) == -1.0
+    assert calc.compile("x ^ 2 + 2 * x * y - 1") is expr
+
+
+def test_compile_folds_constants():
+    calc = Calculator()
+    expr = calc.compile("2 * pi * x + sqrt(16) / 2")
+
+    assert expr.variables == {"x"}
+    assert expr(x=0) == 2.0
+    # Константное выражение вычисляется при компиляции
+    assert calc.compile("(1 + 2) * 3")() == 9.0
+
+
+def test_compile_errors():
+    calc = Calculator()
+
+    with pytest.raises(ValueError, match="Деление на ноль"):
+        calc.compile("x + 1 / 0")
+    with pytest.raises(ValueError, match="Неизвестная функция: foo"):
+        calc.compile("foo(x)")
+
+    expr = calc.compile("1 / x")
+    with pytest.raises(ValueError, match="Деление на ноль"):
+        expr(x=0)
+    with pytest.raises(ValueError, match="Неизвестная переменная: x"):
+        expr()
+
+
+def test_power_cost_limit():
+    calc = Calculator()
+    for expression in ("9 ^ 9 ^ 9", "2 ^ 1000", "0.5 ^ -2000"):
+        assert math.isnan(calc.calculate(expression))
+        assert calc.error_message == "Слишком большой результат (больше 300 цифр)"
+
+    assert calc.calculate("2 ^ 900") == 2.0 ** 900
+    assert calc.calculate("(-2) ^ 3") == -8.0
+    assert math.isnan(calc.calculate("(-8) ^ (1 / 3)"))
+    assert calc.error_message == "Дробная степень отрицательного числа"
+
+
+def test_factorial_cost_limit():
+    calc = Calculator()
+    assert calc.calculate("fact(5) + 1") == 121.0
+
+    assert math.isnan(calc.calculate("fact(1e9)"))
+    assert calc.error_message == "Слишком большой результат (больше 300 цифр)"
+
+    assert math.isnan(calc.calculate("fact(2.5)"))
+    assert calc.error_message == "Недопустимый аргумент функции fact"
+
+
+def test_custom_cost_limits():
+    calc = Calculator(CostLimits(max_digits=3))
+    assert calc.calculate("10 ^ 3") == 1000.0
+    assert math.isnan(calc.calculate("10 ^ 4"))
+    assert calc.error_message == "Слишком большой результат (больше 3 цифр)"
+
+
+def test_evaluate_many_cost_limits():
+    np = pytest.importorskip("numpy")
+    calc = Calculator()
+    x = np.arange(1.0, 400.0)
+
+    result = calc.evaluate_many("x ^ x", {"x": x})
+    assert calc.error_message == "Слишком большой результат (больше 300 цифр)"
+    # 139^139 ещё помещается в 300 цифр, 140^140 — уже нет
+    assert np.isfinite(result[:139]).all() and np.isnan(result[139:]).all()
+
+    assert calc.evaluate_many("fact(x)", {"x": x[:5]}).tolist() == [1.0, 2.0, 6.0, 24.0, 120.0]
+
+    calc = Calculator(CostLimits(max_seconds=0))
+    calc.evaluate_many("x + 1", {"x": x})
+    assert calc.error_message == "Превышено время вычисления (0 с)"
+
+
+def test_incremental_tokenizer_reuses_prefix():
+    tokenizer = IncrementalTokenizer()
+    tokenizer.update("12 + 34 * 5")
+    tokens = tokenizer.update("12 + 34 * 56")
+
+    assert [t.text for t in tokens] == [t.text for t in tokenize("12 + 34 * 56") if t.kind != "end"]
+    # "12", "+", "34" не затронуты; "*" слишком близко к изменению
+    assert tokenizer.reused == 3
+
+    # Символ может продолжить последнюю лексему: "2" -> "2e+5"
+    tokenizer.update("1 + 2")
+    tokens = tokenizer.update("1 + 2e+5")
+    assert tokens[-1].text == "2e+5"
+
+
+def test_calculate_tokens():
+    calc = Calculator()
+    tokenizer = IncrementalTokenizer()
+
+    assert math.isnan(calc.calculate_tokens(tokenizer.update("(1 + 2")))
+    assert calc.calculate_tokens(tokenizer.update("(1 + 2) * 3")) == 9.0
+    assert calc.error_message is None
+
+    assert math.isnan(calc.calculate_tokens(tokenizer.update("(1 + 2) /")))
+    assert calc.error_message == "Неожиданный конец выражения"
@@ -1,7 +1,9 @@
 import os
 import sqlite3
+import threading
 from datetime import datetime, timedelta
 import pytest
+from unittest.mock import patch
 from src.pydesktop_assistant.modules.calendar.calendar import CalendarManager
 
 
@@ -94,3 +96,107 @@ def test_unique_ids(db_path):
 
     manager.delete_event(event2.id)
     manager.delete_event(event3.id)
+
+
+def test_add_events_batch(db_path):
+    """Тест пакетного добавления и удаления событий"""
+    manager = CalendarManager(db_path)
+
+    now = datetime.now() + timedelta(days=1)
+    events = manager.add_events([
+        ("Event 1", "Desc 1", now),
+        ("Event 2", "Desc 2", now + timedelta(hours=1)),
+    ])
+
+    assert [e.id for e in events] == [1, 2]
+    assert [e.title for e in manager.get_all_events()] == ["Event 1", "Event 2"]
+
+    manager.delete_many([e.id for e in events])
+
+    assert manager.get_all_events() == []
+
+
+def test_notification_fires_on_time(db_path):
+    """Тест срабатывания уведомления точно в срок без опроса"""
+    manager = CalendarManager(db_path)
+    fired = threading.Event()
+    notified = []
+
+    def send(event):
+        notified.append(event.id)
+        fired.set()
+
+    with patch.object(manager, "_send_notification", side_effect=send):
+        cancelled = manager.add_event("Cancelled", "Desc", datetime.now() + timedelta(seconds=0.2))
+        manager.delete_event(cancelled.id)
+        event = manager.add_event("Soon", "Desc", datetime.now() + timedelta(seconds=0.3))
+
+        assert fired.wait(timeout=2.0)
+
+    assert notified == [event.id]
+    assert event.notified
+
+    manager.stop_notifications()
+    assert not manager.thread.is_alive()
+    manager.delete_event(event.id)
+
+
+def test_events_between_and_month_cache(db_path):
+    """Тест выборки по интервалу и кеша месяцев"""
+    manager = CalendarManager(db_path)
+
+    may = manager.add_event("May", "Desc", datetime(2030, 5, 31, 23, 59))
+    june = manager.add_event("June", "Desc", datetime(2030, 6, 1, 0, 0))
+
+    events = manager.get_events_between(datetime(2030, 5, 1), datetime(2030, 6, 1))
+    assert [e.id for e in events] == [may.id]
+
+    assert [e.id for e in manager.get_events_for_month(2030, 6)] == [june.id]
+    with patch.object(manager, "get_events_between") as query:
+        manager.get_events_for_month(2030, 6)
+        query.assert_not_called()
+
+    # Добавление и удаление сбрасывают кеш затронутого месяца
+    june2 = manager.add_event("June 2", "Desc", datetime(2030, 6, 15))
+    assert [e.id for e in manager.get_events_for_month(2030, 6)] == [june.id, june2.id]
+    manager.delete_event(june.id)
+    assert [e.id for e in manager.get_events_for_month(2030, 6)] == [june2.id]
+
+    manager.delete_many([may.id, june2.id])
+    assert manager.get_events_for_month(2030, 5) == []
+
+
+def test_startup_loads_only_pending_events(db_path):
+    """Тест загрузки в планировщик только неуведомлённых событий"""
+    manager = CalendarManager(db_path)
+    manager.stop_notifications()
+
+    past = manager.add_event("Past", "Desc", datetime.now() - timedelta(days=1))
+    future = manager.add_event("Future", "Desc", datetime.now() + timedelta(days=1))
+    manager._mark_as_notified(past)
+
+    restarted = CalendarManager(db_path)
+    restarted.stop_notifications()
+
+    assert set(restarted._pending) == {future.id}
+
+    restarted.delete_many([past.id, future.id])
+
+
+def test_mark_as_notified_skips_reused_id(db_path):
+    """Тест: отметка удалённого события не переходит на новое с тем же ID"""
+    manager = CalendarManager(db_path)
+    manager.stop_notifications()
+
+    old = manager.add_event("Old", "Desc", datetime.now() + timedelta(days=1))
+    manager.delete_event(old.id)
+    new = manager.add_event("New", "Desc", datetime.now() + timedelta(days=2))
+    assert new.id == old.id
+
+    manager._mark_as_notified(old)
+
+    restarted = CalendarManager(db_path)
+    restarted.stop_notifications()
+    assert new.id in restarted._pending
+
+    restarted.delete_event(new.id)
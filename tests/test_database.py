@@ -0,0 +1,78 @@
+import threading
+import pytest
+from src.pydesktop_assistant.storage.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Фикстура для создания временной базы данных"""
+    database = Database(tmp_path / "test.db")
+    with database.transaction() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    yield database
+    database.close()
+
+
+def test_connection_reused_in_thread(db):
+    """Тест переиспользования соединения в одном потоке"""
+    assert db.connection() is db.connection()
+
+
+def test_connection_per_thread(db):
+    """Тест отдельного соединения для каждого потока"""
+    connections = []
+    thread = threading.Thread(target=lambda: connections.append(db.connection()))
+    thread.start()
+    thread.join()
+
+    assert connections[0] is not db.connection()
+
+
+def test_wal_mode(db):
+    """Тест включения журнала WAL"""
+    mode = db.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_transaction_rollback(db):
+    """Тест отката транзакции при ошибке"""
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO items (id, name) VALUES (1, 'a')")
+            raise RuntimeError("fail")
+
+    assert db.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+def test_nested_transaction(db):
+    """Тест вложенной транзакции: фиксирует только внешний блок"""
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            with db.transaction() as inner:
+                inner.execute("INSERT INTO items (id, name) VALUES (1, 'a')")
+            assert conn.in_transaction
+            raise RuntimeError("fail")
+
+    assert db.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+def test_shared_instance(tmp_path):
+    """Тест общего экземпляра для одного файла БД"""
+    path = tmp_path / "shared.db"
+    assert Database.shared(path) is Database.shared(str(path))
+
+
+def test_iter_keyset(db):
+    """Тест постраничного обхода по ключу"""
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO items (id, name) VALUES (?, ?)",
+            [(i, f"item {i}") for i in (1, 2, 5, 7, 8)]
+        )
+
+    rows = db.iter_keyset(
+        "SELECT id, name FROM items WHERE id > ? ORDER BY id LIMIT ?",
+        chunk_size=2
+    )
+
+    assert [row[0] for row in rows] == [1, 2, 5, 7, 8]
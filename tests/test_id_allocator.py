@@ -0,0 +1,56 @@
+import pytest
+from src.pydesktop_assistant.storage.database import Database
+from src.pydesktop_assistant.storage.id_allocator import FreeIdAllocator
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Фикстура для создания временной базы данных"""
+    database = Database(tmp_path / "test.db")
+    with database.transaction() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    yield database
+    database.close()
+
+
+def _insert(db, allocator, count=1):
+    with db.transaction() as conn:
+        ids = allocator.allocate(conn, count)
+        conn.executemany("INSERT INTO items (id) VALUES (?)", ((i,) for i in ids))
+    return ids
+
+
+def test_sequential_ids(db):
+    """Тест последовательной выдачи ID"""
+    allocator = FreeIdAllocator("items")
+    with db.transaction() as conn:
+        allocator.install(conn)
+
+    assert _insert(db, allocator, 3) == [1, 2, 3]
+    assert _insert(db, allocator) == [4]
+
+
+def test_reuse_lowest_id(db):
+    """Тест повторного использования минимального освобождённого ID"""
+    allocator = FreeIdAllocator("items")
+    with db.transaction() as conn:
+        allocator.install(conn)
+    _insert(db, allocator, 5)
+
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM items WHERE id IN (4, 2, 5)")
+
+    assert _insert(db, allocator) == [2]
+    assert _insert(db, allocator, 3) == [4, 5, 6]
+
+
+def test_install_backfills_existing_gaps(db):
+    """Тест переноса пропусков из уже заполненной таблицы"""
+    with db.transaction() as conn:
+        conn.executemany("INSERT INTO items (id) VALUES (?)", [(2,), (3,), (6,)])
+
+    allocator = FreeIdAllocator("items")
+    with db.transaction() as conn:
+        allocator.install(conn)
+
+    assert _insert(db, allocator, 4) == [1, 4, 5, 7]
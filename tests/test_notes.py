@@ -84,3 +84,113 @@ def test_unique_ids(db_path):
 
     manager.delete_note(note2.id)
     manager.delete_note(note3.id)
+
+
+def test_create_notes_batch(db_path):
+    """Тест пакетного создания и удаления заметок"""
+    manager = NoteManager(db_path)
+
+    notes = manager.create_notes([("A", "1"), ("B", "2"), ("C", "3")])
+
+    assert [n.id for n in notes] == [1, 2, 3]
+    assert [n.title for n in notes] == ["A", "B", "C"]
+    assert len(manager.get_all_notes()) == 3
+
+    manager.delete_many([notes[0].id, notes[2].id])
+
+    assert [n.id for n in manager.get_all_notes()] == [2]
+
+    manager.delete_many([notes[1].id])
+    assert manager.create_notes([]) == []
+
+
+def test_search_notes(db_path):
+    """Тест полнотекстового поиска заметок"""
+    manager = NoteManager(db_path)
+
+    shopping = manager.create_note("Покупки", "Купить молоко и хлеб")
+    meeting = manager.create_note("Встреча", "Обсудить покупки на неделю")
+    other = manager.create_note("Идеи", "Написать статью")
+
+    results = manager.search("покупк")
+
+    # Совпадение в заголовке ранжируется выше совпадения в тексте
+    assert [r.note.id for r in results] == [shopping.id, meeting.id]
+    assert results[0].title_snippet == "[Покупки]"
+    assert "[покупки]" in results[1].content_snippet
+
+    assert [r.note.id for r in manager.search("молоко хлеб")] == [shopping.id]
+    assert [r.note.id for r in manager.search("покупк", limit=1, offset=1)] == [meeting.id]
+    assert manager.search("   ") == []
+
+    manager.delete_note(shopping.id)
+    assert [r.note.id for r in manager.search("покупк")] == [meeting.id]
+
+    manager.delete_many([meeting.id, other.id])
+
+
+def test_notes_pagination(db_path):
+    """Тест постраничного чтения и подсчёта заметок"""
+    manager = NoteManager(db_path)
+
+    notes = manager.create_notes([(f"Note {i}", "Текст") for i in range(5)])
+
+    assert manager.count_notes() == 5
+    assert [n.id for n in manager.get_notes_page(offset=2, limit=2)] == [3, 4]
+    assert manager.search_count("текст") == 5
+    assert manager.search_count("") == 0
+
+    manager.delete_many(n.id for n in notes)
+
+
+def test_search_short_terms(db_path):
+    """Тест: слово из одной буквы ищется целиком, а не как префикс"""
+    manager = NoteManager(db_path)
+
+    vitamin = manager.create_note("Витамин C", "Апельсины")
+    cat = manager.create_note("Кот", "Купить корм")
+
+    assert [r.note.id for r in manager.search("c")] == [vitamin.id]
+    assert manager.search_count("к") == 0
+    assert [r.note.id for r in manager.search("ко")] == [cat.id]
+
+    manager.delete_many([vitamin.id, cat.id])
+
+
+def test_like_fallback_escapes_wildcards(db_path):
+    """Тест: % и _ в запросе без FTS5 ищутся буквально"""
+    manager = NoteManager(db_path)
+    manager.fts_enabled = False
+
+    plain = manager.create_note("Заметка", "Обычный текст")
+    percent = manager.create_note("Скидка", "Минус 50% на всё")
+    underscore = manager.create_note("Файл", "my_file.txt")
+
+    assert [r.note.id for r in manager.search("%")] == [percent.id]
+    assert manager.search_count("_") == 1
+    assert [r.note.id for r in manager.search("y_f")] == [underscore.id]
+
+    manager.delete_many([plain.id, percent.id, underscore.id])
+
+
+def test_fts_index_upgraded_with_prefixes(tmp_path):
+    """Тест пересоздания индекса FTS5, созданного без индекса префиксов"""
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, content TEXT NOT NULL)")
+    conn.execute("INSERT INTO notes (title, content) VALUES ('Старая', 'Заметка до обновления')")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE notes_fts USING fts5(title, content, content='notes', content_rowid='id')")
+    except sqlite3.OperationalError:
+        pytest.skip("SQLite собран без FTS5")
+    conn.commit()
+    conn.close()
+
+    manager = NoteManager(path)
+
+    sql = manager.db.execute("SELECT sql FROM sqlite_master WHERE name = 'notes_fts'").fetchone()[0]
+    assert "prefix" in sql
+    assert [r.note.title for r in manager.search("обнов")] == ["Старая"]
+    manager.create_note("Новая", "Заметка после обновления")
+    assert manager.search_count("обнов") == 2
+    manager.db.close()
@@ -0,0 +1,111 @@
+import threading
+import time
+from src.pydesktop_assistant.notifications import NotificationDispatcher
+
+
+class Recorder:
+    """Приёмник показанных уведомлений"""
+
+    def __init__(self):
+        self.shown = []
+        self.lock = threading.Lock()
+
+    def __call__(self, title, message):
+        with self.lock:
+            self.shown.append((title, message))
+
+
+def test_single_notification_shown_as_is():
+    """Тест: одиночное уведомление показывается без изменений"""
+    recorder = Recorder()
+    dispatcher = NotificationDispatcher(coalesce_window=0, deliver=recorder)
+
+    dispatcher.notify("Таймер завершен!", "Чай")
+
+    assert dispatcher.flush()
+    assert recorder.shown == [("Таймер завершен!", "Чай")]
+    dispatcher.shutdown()
+
+
+def test_burst_coalesced_into_summary():
+    """Тест склейки пачки уведомлений в одно сводное"""
+    recorder = Recorder()
+    dispatcher = NotificationDispatcher(coalesce_window=0.2, deliver=recorder)
+
+    for i in range(5):
+        dispatcher.notify(f"Событие {i}", f"Описание {i}")
+
+    assert dispatcher.flush()
+    assert len(recorder.shown) == 1
+    title, message = recorder.shown[0]
+    assert title == "Новых уведомлений: 5"
+    assert message.splitlines() == [
+        "Событие 0: Описание 0",
+        "Событие 1: Описание 1",
+        "Событие 2: Описание 2",
+        "…и ещё 2",
+    ]
+
+    stats = dispatcher.stats()
+    assert stats["delivered"] == 5
+    assert stats["shown"] == 1
+    assert stats["coalesced"] == 5
+    assert stats["queued"] == 0
+    assert stats["latency_max_ms"] >= stats["latency_p50_ms"] > 0
+    dispatcher.shutdown()
+
+
+def test_rate_limit_coalesces_excess():
+    """Тест: сверх burst уведомления копятся и показываются сводным"""
+    recorder = Recorder()
+    dispatcher = NotificationDispatcher(rate=5.0, burst=1, coalesce_window=0, deliver=recorder)
+
+    dispatcher.notify("Первое", "1")
+    assert dispatcher.flush()
+    start = time.monotonic()
+    for i in range(3):
+        dispatcher.notify("Следующее", str(i))
+    assert dispatcher.flush()
+
+    # Токен восстанавливается за 1 / rate = 0.2 с
+    assert time.monotonic() - start >= 0.15
+    assert len(recorder.shown) == 2
+    assert recorder.shown[1][0] == "Новых уведомлений: 3"
+    dispatcher.shutdown()
+
+
+def test_shutdown_delivers_pending_without_waiting():
+    """Тест: при остановке оставшиеся уведомления показываются сразу"""
+    recorder = Recorder()
+    dispatcher = NotificationDispatcher(rate=0.01, burst=1, coalesce_window=0, deliver=recorder)
+
+    dispatcher.notify("Первое", "1")
+    assert dispatcher.flush()
+    dispatcher.notify("Второе", "2")
+
+    start = time.monotonic()
+    dispatcher.shutdown(timeout=2.0)
+
+    assert time.monotonic() - start < 1.0
+    assert recorder.shown == [("Первое", "1"), ("Второе", "2")]
+
+
+def test_failing_delivery_keeps_worker_alive(capsys):
+    """Тест: ошибка показа не останавливает рабочий поток"""
+    calls = []
+
+    def deliver(title, message):
+        calls.append(title)
+        if len(calls) == 1:
+            raise RuntimeError("нет дисплея")
+
+    dispatcher = NotificationDispatcher(coalesce_window=0, deliver=deliver)
+
+    dispatcher.notify("Первое", "1")
+    assert dispatcher.flush()
+    dispatcher.notify("Второе", "2")
+    assert dispatcher.flush()
+
+    assert calls == ["Первое", "Второе"]
+    assert "Ошибка отправки уведомления: нет дисплея" in capsys.readouterr().out
+    dispatcher.shutdown()
@@ -0,0 +1,45 @@
+import pytest
+from src.pydesktop_assistant.services import ServiceRegistry
+
+
+@pytest.fixture
+def services(tmp_path):
+    """Фикстура реестра сервисов во временном каталоге"""
+    registry = ServiceRegistry(tmp_path)
+    yield registry
+    registry.shutdown()
+
+
+def test_managers_created_once(services, tmp_path):
+    """Тест: каждый менеджер создаётся один раз и хранит БД в data_dir"""
+    assert services.notes is services.notes
+    assert services.tasks is services.tasks
+    assert services.calendar is services.calendar
+    assert services.timers is services.timers
+    assert services.io_pool is services.io_pool
+    assert services.timers.notifier is services.notifications
+    assert services.calendar.notifier is services.notifications
+
+    assert services.notes.db_path == tmp_path / "notes.db"
+    assert services.calendar.db_path == tmp_path / "calendar.db"
+
+
+def test_shutdown_stops_threads(tmp_path):
+    """Тест остановки фоновых потоков и запрета повторного использования"""
+    registry = ServiceRegistry(tmp_path)
+    calendar = registry.calendar
+    timers = registry.timers
+    timers.start_timer(60, "Test")
+    notes = registry.notes
+    registry.io_pool.submit(notes.create_note, "Title", "Content")
+
+    registry.shutdown()
+
+    assert not calendar.thread.is_alive()
+    assert not timers._thread.is_alive()
+    assert not timers.notifier._running
+    # Отправленная до остановки запись успела выполниться
+    assert notes.count_notes() == 1
+    notes.db.close()
+    with pytest.raises(RuntimeError):
+        registry.notes
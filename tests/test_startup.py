@@ -0,0 +1,18 @@
+from benchmarks.bench_startup import import_profile
+
+# Бюджет времени импорта главного окна, мс (лучший из нескольких прогонов)
+IMPORT_BUDGET_MS = 250
+
+
+def test_main_window_skips_heavy_imports():
+    """Тест: главное окно не загружает plyer и tkcalendar"""
+    profile = import_profile()
+
+    assert profile["heavy_loaded"] == []
+
+
+def test_main_window_import_budget():
+    """Тест бюджета времени импорта главного окна"""
+    best = min(import_profile()["import_ms"] for _ in range(3))
+
+    assert best < IMPORT_BUDGET_MS
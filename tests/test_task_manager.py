@@ -223,3 +223,104 @@ def test_completed_status_persistence(db_path):
     assert tasks[0].is_completed
 
     manager2.delete_task(task.id)
+
+
+def test_create_tasks_batch(db_path):
+    """Тест пакетного создания и удаления задач"""
+    manager = TaskManager(db_path)
+
+    now = datetime.now()
+    tasks = manager.create_tasks([
+        ("Task 1", "high", now),
+        ("Task 2", "low", now + timedelta(days=1)),
+    ])
+
+    assert [t.id for t in tasks] == [1, 2]
+    assert [t.priority for t in tasks] == ["high", "low"]
+    assert tasks[1].due_date == now + timedelta(days=1)
+
+    manager.delete_many(t.id for t in tasks)
+
+    assert manager.get_all_tasks() == []
+
+
+def test_iter_tasks(db_path):
+    """Тест потокового обхода задач порциями"""
+    manager = TaskManager(db_path)
+
+    now = datetime.now()
+    tasks = manager.create_tasks([(f"Task {i}", "low", now) for i in range(5)])
+    manager.delete_task(tasks[2].id)
+
+    ids = [t.id for t in manager.iter_tasks(chunk_size=2)]
+
+    assert ids == [1, 2, 4, 5]
+    assert manager.get_all_tasks()[0].due_date == now
+
+    manager.delete_many(ids)
+
+
+def test_is_overdue_everywhere(db_path):
+    """Тест: просроченность одинакова во всех способах получения задач"""
+    manager = TaskManager(db_path)
+
+    now = datetime.now()
+    overdue = manager.create_task("Overdue", "low", now - timedelta(days=1))
+    future = manager.create_task("Future", "low", now + timedelta(days=1))
+
+    assert overdue.is_overdue and not future.is_overdue
+    assert [t.is_overdue for t in manager.get_all_tasks()] == [True, False]
+    assert [t.is_overdue for t in manager.query()] == [True, False]
+
+    manager.toggle_task_status(overdue.id)
+    assert not manager.get_all_tasks()[0].is_overdue
+
+    manager.delete_many([overdue.id, future.id])
+
+
+def test_query_filters_and_sorting(db_path):
+    """Тест фильтрации и сортировки задач в SQL"""
+    manager = TaskManager(db_path)
+
+    now = datetime(2024, 6, 1, 12, 0)
+    overdue, done, later, soon = manager.create_tasks([
+        ("Overdue", "low", now - timedelta(days=1)),
+        ("Done", "high", now - timedelta(days=2)),
+        ("Later", "medium", now + timedelta(days=5)),
+        ("Soon", "high", now + timedelta(days=1)),
+    ])
+    manager.toggle_task_status(done.id)
+
+    result = manager.query(completed=False, due_before=now, now=now)
+    assert [t.id for t in result] == [overdue.id]
+    assert result[0].is_overdue
+
+    result = manager.query(completed=False, due_after=now, order_by="due_date", now=now)
+    assert [t.id for t in result] == [soon.id, later.id]
+    assert not any(t.is_overdue for t in result)
+
+    result = manager.query(order_by="priority", now=now)
+    assert [t.id for t in result] == [done.id, soon.id, later.id, overdue.id]
+    assert not result[0].is_overdue  # выполненная задача не считается просроченной
+
+    assert [t.id for t in manager.query(priority="high", order_by="-id")] == [soon.id, done.id]
+    assert [t.id for t in manager.query(completed=True)] == [done.id]
+    assert [t.id for t in manager.query(limit=2, offset=1)] == [done.id, later.id]
+    assert manager.count(completed=False, due_before=now) == 1
+    assert manager.count() == 4
+
+    with pytest.raises(ValueError):
+        manager.query(order_by="unknown")
+
+    manager.delete_many([overdue.id, done.id, later.id, soon.id])
+
+
+def test_query_uses_indexes(db_path):
+    """Тест использования индексов при фильтрации"""
+    manager = TaskManager(db_path)
+
+    plan = manager.db.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE is_completed = 0 AND due_date < ?",
+        (datetime.now().isoformat(),)
+    ).fetchall()
+    assert any("idx_tasks_completed_due" in row[-1] for row in plan)
@@ -0,0 +1,36 @@
+import tkinter as tk
+import pytest
+from unittest.mock import patch
+from tkinter import ttk
+from src.pydesktop_assistant.gui.theme import STYLES, apply_theme
+
+
+@pytest.fixture
+def root():
+    """Фикстура корневого окна Tk (тесты пропускаются без дисплея)"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk недоступен: нет дисплея")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_theme_applied_once(root):
+    """Тест: стили настраиваются только при первом вызове"""
+    with patch.object(ttk.Style, "configure") as configure:
+        apply_theme(root)
+        first_calls = configure.call_count
+        apply_theme(tk.Toplevel(root))
+
+    assert first_calls == len(STYLES)
+    assert configure.call_count == first_calls
+
+
+def test_named_variants(root):
+    """Тест именованных вариантов стилей модулей"""
+    style = apply_theme(root)
+
+    assert style.lookup("Calculator.TButton", "padding")
+    assert style.lookup("Main.TButton", "font") != style.lookup("TButton", "font")
@@ -1,14 +1,15 @@
 import threading
 import time
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from src.pydesktop_assistant.modules.timer.timer import TimerManager
+from src.pydesktop_assistant.notifications import NotificationDispatcher
 
 
 @pytest.fixture
 def timer_manager():
     """Фикстура для создания экземпляра TimerManager"""
-    return TimerManager()
+    return TimerManager(notifier=NotificationDispatcher(coalesce_window=0))
 
 
 def test_start_timer(timer_manager):
@@ -17,11 +18,13 @@ def test_start_timer(timer_manager):
 
     assert timer_id in timer_manager.timers
     assert timer_manager.timers[timer_id]["message"] == "Test message"
-    assert isinstance(timer_manager.timers[timer_id]["timer"], threading.Timer)
 
     expected_end = time.time() + 5
     assert abs(timer_manager.timers[timer_id]["end_time"] - expected_end) < 0.1
 
+    expected_deadline = time.monotonic() + 5
+    assert abs(timer_manager.timers[timer_id]["deadline"] - expected_deadline) < 0.1
+
 
 def test_cancel_timer(timer_manager):
     """Тест отмены таймера"""
@@ -34,13 +37,10 @@ def test_cancel_timer(timer_manager):
 @patch('plyer.notification.notify')
 def test_timer_completion(mock_notify, timer_manager):
     """Тест завершения таймера и отправки уведомления"""
-    with patch('threading.Timer') as mock_timer:
-        mock_timer_instance = MagicMock()
-        mock_timer.return_value = mock_timer_instance
-
-        timer_id = timer_manager.start_timer(1, "Test completion")
+    timer_id = timer_manager.start_timer(10, "Test completion")
 
-        timer_manager._timer_completed(timer_id, "Test completion")
+    timer_manager._timer_completed(timer_id, "Test completion")
+    assert timer_manager.notifier.flush()
 
     mock_notify.assert_called_once_with(
         title="Таймер завершен!",
@@ -85,6 +85,7 @@ def test_id_increment(timer_manager):
 def test_notification_fallback(mock_notify, capsys, timer_manager):
     """Тест fallback при ошибке уведомления"""
     timer_manager._timer_completed(1, "Test error")
+    assert timer_manager.notifier.flush()
 
     captured = capsys.readouterr()
     assert "Уведомление: Таймер завершен! - Test error" in captured.out
@@ -126,3 +127,38 @@ def test_remaining_time_calculation(timer_manager):
     timer_info = next(t for t in active_timers if t["id"] == timer_id)
 
     assert 8 <= timer_info["remaining"] <= 9
+
+
+def test_single_scheduler_thread(timer_manager):
+    """Тест обслуживания всех таймеров одним потоком"""
+    threads_before = threading.active_count()
+
+    for i in range(200):
+        timer_manager.start_timer(60, f"Timer {i}")
+
+    assert threading.active_count() - threads_before <= 1
+    timer_manager.shutdown()
+
+
+def test_timers_fire_in_order(timer_manager):
+    """Тест срабатывания таймеров и пропуска отменённых"""
+    fired = []
+    done = threading.Event()
+
+    def completed(timer_id, message):
+        fired.append(message)
+        timer_manager.timers.pop(timer_id, None)
+        if len(fired) == 2:
+            done.set()
+
+    with patch.object(timer_manager, "_timer_completed", side_effect=completed):
+        timer_manager.start_timer(0.3, "Second")
+        cancelled = timer_manager.start_timer(0.1, "Cancelled")
+        timer_manager.start_timer(0.2, "First")
+        timer_manager.cancel_timer(cancelled)
+
+        assert done.wait(timeout=2.0)
+
+    assert fired == ["First", "Second"]
+    assert timer_manager.timers == {}
+    timer_manager.shutdown()
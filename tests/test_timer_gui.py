@@ -0,0 +1,138 @@
+from itertools import count
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.pydesktop_assistant.modules.timer.gui import TimerGUI
+
+
+class FakeTreeview:
+    """Замена Treeview: запоминает операции над строками"""
+
+    def __init__(self):
+        self.rows = {}
+        self.calls = []
+        self._next = 0
+
+    def insert(self, parent, index, values):
+        self._next += 1
+        item = f"I{self._next}"
+        self.rows[item] = dict(zip(("id", "time_left", "message"), values))
+        self.calls.append(("insert", item))
+        return item
+
+    def set(self, item, column, value):
+        self.rows[item][column] = value
+        self.calls.append(("set", item, column))
+
+    def delete(self, *items):
+        for item in items:
+            del self.rows[item]
+        self.calls.append(("delete", *items))
+
+
+class FakeTimerManager:
+    def __init__(self):
+        self.timers = []
+
+    def get_active_timers(self):
+        return list(self.timers)
+
+
+def make_gui():
+    """TimerGUI без окна Tk: after/after_cancel и таблица подменены"""
+    gui = TimerGUI.__new__(TimerGUI)
+    gui.jobs = {}
+    numbers = count(1)
+
+    def after(ms, func):
+        job = f"after#{next(numbers)}"
+        gui.jobs[job] = (ms, func)
+        return job
+
+    gui.after = after
+    gui.after_cancel = lambda job: gui.jobs.pop(job, None)
+    gui.timer_manager = FakeTimerManager()
+    gui.timers_list = FakeTreeview()
+    gui._timer_rows = {}
+    gui._tick_job = None
+    gui._paused = False
+    return gui
+
+
+def event(gui):
+    return SimpleNamespace(widget=gui)
+
+
+@patch("src.pydesktop_assistant.modules.timer.gui.time.monotonic")
+def test_tick_aligned_to_whole_second(monotonic):
+    """Тест: следующее обновление приходится на ближайшую границу секунды"""
+    gui = make_gui()
+
+    monotonic.return_value = 100.25
+    gui._tick()
+    assert [ms for ms, _ in gui.jobs.values()] == [751]
+
+    # Обновление запоздало — задержка сокращается, дрейф не копится
+    gui.jobs.clear()
+    monotonic.return_value = 101.75
+    gui._tick()
+    assert [ms for ms, _ in gui.jobs.values()] == [251]
+
+
+def test_only_time_cell_updated():
+    """Тест: у существующей строки меняется только ячейка времени"""
+    gui = make_gui()
+    gui.timer_manager.timers = [{"id": 1, "remaining": 65, "message": "Чай"}]
+
+    gui._update_timers_list()
+    gui.timer_manager.timers = [{"id": 1, "remaining": 64, "message": "Чай"}]
+    gui._update_timers_list()
+    # Время не изменилось — таблицу не трогаем
+    gui._update_timers_list()
+
+    assert gui.timers_list.calls == [("insert", "I1"), ("set", "I1", "time_left")]
+    assert gui.timers_list.rows["I1"] == {"id": 1, "time_left": "00:01:04", "message": "Чай"}
+
+    gui.timer_manager.timers = []
+    gui._update_timers_list()
+    assert gui.timers_list.calls[-1] == ("delete", "I1")
+    assert gui._timer_rows == {}
+
+
+def test_unmap_pauses_and_map_resumes():
+    """Тест: свёрнутое окно не обновляется, при показе обновления возобновляются"""
+    gui = make_gui()
+    gui._tick()
+    assert len(gui.jobs) == 1
+
+    gui._on_unmap(event(gui))
+    assert gui.jobs == {}
+    assert gui._tick_job is None
+
+    # Пока окно скрыто, обновление не планируется
+    gui._schedule_tick()
+    assert gui.jobs == {}
+
+    gui._on_map(event(gui))
+    assert len(gui.jobs) == 1
+    assert gui._tick_job in gui.jobs
+
+
+def test_events_of_child_widgets_ignored():
+    """Тест: Unmap дочернего виджета не останавливает обновления"""
+    gui = make_gui()
+    gui._tick()
+
+    gui._on_unmap(SimpleNamespace(widget=object()))
+
+    assert len(gui.jobs) == 1
+
+
+def test_destroy_leaves_no_job():
+    """Тест: после закрытия окна не остаётся запланированных обновлений"""
+    gui = make_gui()
+    gui._tick()
+
+    gui._on_destroy(event(gui))
+
+    assert gui.jobs == {}
+    assert gui._tick_job is None
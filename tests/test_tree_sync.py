@@ -0,0 +1,100 @@
+import itertools
+from src.pydesktop_assistant.gui.tree_sync import TreeviewSync
+
+
+class FakeTreeview:
+    """Минимальная замена ttk.Treeview, записывающая вызовы"""
+
+    def __init__(self):
+        self.children = []  # id элементов в порядке отображения
+        self.data = {}  # id -> {"values": ..., "tags": ...}
+        self.calls = []
+        self._ids = itertools.count(1)
+
+    def insert(self, parent, index, values, tags):
+        item = f"I{next(self._ids)}"
+        self.children.insert(index, item)
+        self.data[item] = {"values": values, "tags": tags}
+        self.calls.append("insert")
+        return item
+
+    def delete(self, *items):
+        for item in items:
+            self.children.remove(item)
+            del self.data[item]
+        self.calls.append("delete")
+
+    def item(self, item, values, tags):
+        self.data[item] = {"values": values, "tags": tags}
+        self.calls.append("item")
+
+    def move(self, item, parent, index):
+        self.children.remove(item)
+        self.children.insert(index, item)
+        self.calls.append("move")
+
+    def rows(self):
+        return [self.data[item]["values"] for item in self.children]
+
+
+def test_initial_fill():
+    """Тест первоначального заполнения таблицы"""
+    tree = FakeTreeview()
+    TreeviewSync(tree).sync([(1, ("a",), ()), (2, ("b",), ())])
+
+    assert tree.rows() == [("a",), ("b",)]
+    assert tree.calls == ["insert", "insert"]
+
+
+def test_only_changed_rows_touched():
+    """Тест обновления только изменившихся строк"""
+    tree = FakeTreeview()
+    sync = TreeviewSync(tree)
+    sync.sync([(1, ("a",), ()), (2, ("b",), ()), (3, ("c",), ())])
+    tree.calls.clear()
+
+    sync.sync([(1, ("a",), ()), (3, ("c!",), ("overdue",)), (4, ("d",), ())])
+
+    assert tree.rows() == [("a",), ("c!",), ("d",)]
+    assert tree.data[tree.children[1]]["tags"] == ("overdue",)
+    assert tree.calls == ["delete", "item", "insert"]
+
+
+def test_insert_in_middle():
+    """Тест вставки строки между существующими"""
+    tree = FakeTreeview()
+    sync = TreeviewSync(tree)
+    sync.sync([(1, ("a",), ()), (3, ("c",), ())])
+    tree.calls.clear()
+
+    sync.sync([(1, ("a",), ()), (2, ("b",), ()), (3, ("c",), ())])
+
+    assert tree.rows() == [("a",), ("b",), ("c",)]
+    assert tree.calls == ["insert"]
+
+
+def test_reorder():
+    """Тест перестановки строк при смене сортировки"""
+    tree = FakeTreeview()
+    sync = TreeviewSync(tree)
+    sync.sync([(1, ("a",), ()), (2, ("b",), ()), (3, ("c",), ())])
+
+    sync.sync([(3, ("c",), ()), (1, ("a",), ()), (2, ("b",), ())])
+
+    assert tree.rows() == [("c",), ("a",), ("b",)]
+    assert "insert" not in tree.calls[3:]
+
+
+def test_key_lookup():
+    """Тест поиска элемента по ключу и ключа по элементу"""
+    tree = FakeTreeview()
+    sync = TreeviewSync(tree)
+    sync.sync([(1, ("a",), ()), (2, ("b",), ())])
+
+    item = sync.item_for(2)
+    assert sync.key_for(item) == 2
+    assert sync.keys() == [1, 2]
+
+    sync.sync([(1, ("a",), ())])
+    assert sync.item_for(2) is None
+    assert sync.key_for(item) is None
@@ -0,0 +1,163 @@
+import tkinter as tk
+import pytest
+from src.pydesktop_assistant.gui.virtual_list import PagedRowSource, VirtualList
+
+
+def make_source(total, page_size=10, max_pages=3):
+    """Источник из `total` строк с подсчётом запросов страниц"""
+    fetched = []
+
+    def fetch(offset, limit):
+        fetched.append(offset)
+        return [(i, (i,), ()) for i in range(offset, min(offset + limit, total))]
+
+    source = PagedRowSource(lambda: total, fetch, page_size=page_size, max_pages=max_pages)
+    source.reload()
+    return source, fetched
+
+
+def test_rows_across_pages():
+    """Тест получения окна строк на стыке страниц"""
+    source, fetched = make_source(35)
+
+    rows = source.rows(8, 13)
+
+    assert [row[0] for row in rows] == [8, 9, 10, 11, 12]
+    assert fetched == [0, 10]
+
+
+def test_rows_clamped_to_total():
+    """Тест окна, выходящего за конец данных"""
+    source, _ = make_source(35)
+
+    assert [row[0] for row in source.rows(30, 50)] == [30, 31, 32, 33, 34]
+    assert make_source(0)[0].rows(0, 10) == []
+
+
+def test_page_cache_lru():
+    """Тест кеша страниц: повторный запрос не обращается к источнику"""
+    source, fetched = make_source(100, max_pages=2)
+
+    source.rows(0, 5)
+    source.rows(10, 15)
+    source.rows(0, 5)
+    assert fetched == [0, 10]
+
+    source.rows(20, 25)  # вытесняет страницу 10
+    source.rows(10, 15)
+    assert fetched == [0, 10, 20, 10]
+
+
+def test_reload_drops_cache():
+    """Тест сброса кеша при перечитывании"""
+    source, fetched = make_source(20)
+
+    source.rows(0, 5)
+    source.reload()
+    source.rows(0, 5)
+
+    assert fetched == [0, 0]
+
+
+def test_missing_and_stored_pages():
+    """Тест фоновой подгрузки: недостающие страницы и их сохранение"""
+    source, fetched = make_source(35)
+    source.reset(35)
+
+    assert source.missing_pages(8, 25) == [0, 1, 2]
+
+    source.store_page(1, [(i, (i,), ()) for i in range(10, 20)])
+    assert source.missing_pages(8, 25) == [0, 2]
+    assert [row[0] for row in source.rows(12, 15)] == [12, 13, 14]
+    assert fetched == []
+
+
+class DeferredExecutor:
+    """Исполнитель, который выполняет задачи только по команде"""
+
+    def __init__(self):
+        self.jobs = []
+        self.errors = []
+
+    def submit(self, func, *args, on_success=None, on_error=None, **kwargs):
+        self.jobs.append((func, args, on_success, on_error))
+
+    def run_all(self):
+        jobs, self.jobs = self.jobs, []
+        for func, args, on_success, on_error in jobs:
+            try:
+                result = func(*args)
+            except Exception as error:
+                (on_error or self.report_error)(error)
+            else:
+                on_success(result)
+
+    def report_error(self, error):
+        self.errors.append(error)
+
+
+@pytest.fixture
+def root():
+    """Фикстура корневого окна Tk (тесты пропускаются без дисплея)"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk недоступен: нет дисплея")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_keyboard_selection_waits_for_page(root):
+    """Тест: выделение клавишами не теряется, пока страница грузится в фоне"""
+    executor = DeferredExecutor()
+    view = VirtualList(
+        root,
+        ("value",),
+        count=lambda: 100,
+        fetch=lambda offset, limit: [(i, (i,), ()) for i in range(offset, offset + limit)],
+        height=5,
+        page_size=10,
+        executor=executor
+    )
+    view.refresh()
+    executor.run_all()
+    executor.run_all()
+
+    for _ in range(5):
+        view._move_selection(1)
+    assert view.selected_key() == 4
+
+    # Окно сдвигается на строки страницы 1, которая ещё не загружена
+    view._move_selection(1)
+    view._move_selection(1)
+    assert view.selected_key() == 4
+    executor.run_all()
+
+    assert view.selected_key() == 6
+
+
+def test_failed_page_is_requested_again(root):
+    """Тест: страницу, которую не удалось загрузить, можно запросить повторно"""
+    executor = DeferredExecutor()
+    failures = [RuntimeError("database is locked")]
+
+    def fetch(offset, limit):
+        if failures:
+            raise failures.pop()
+        return [(i, (i,), ()) for i in range(offset, offset + limit)]
+
+    view = VirtualList(
+        root, ("value",), count=lambda: 100, fetch=fetch,
+        height=5, page_size=10, executor=executor
+    )
+    view.refresh()
+    executor.run_all()
+    executor.run_all()
+
+    assert [str(error) for error in executor.errors] == ["database is locked"]
+    assert view._requested == set()
+
+    view._render()
+    executor.run_all()
+    assert view._sync.keys()[:3] == [0, 1, 2]